@@ -7,7 +7,6 @@ import plotly.utils
 import json
 from urllib.parse import urlparse, urljoin
 import nltk
-from textblob import TextBlob
 import re
 from collections import Counter
 import os
@@ -18,10 +17,19 @@ from reportlab.platypus import SimpleDocTemplate, Paragraph, Spacer, Table, Tabl
 from reportlab.lib.styles import getSampleStyleSheet, ParagraphStyle
 from io import BytesIO
 from datetime import datetime
-import time
+from threading import Thread
 from src.analyzers.performance_analyzer import PerformanceAnalyzer
 from src.analyzers.mobile_analyzer import MobileAnalyzer
+from src.analyzers.head_analyzer import HeadAnalyzer, fetch_head
+from src.analyzers.readability_analyzer import ReadabilityAnalyzer
+from src.analyzers.sentiment_analyzer import SentimentAnalyzer
 from src.utils.helpers import save_analysis, load_analysis, list_saved_analyses, format_score, format_status
+from src.utils.sitemap import ingest_sitemap
+from src.utils.shared_store import get_shared_store, run_worker
+from src.utils.content_extractor import extract_main_content
+from src.utils.http_client import fetch
+from src.utils.result_store import get_result_store, summarize_result
+from src.utils.streaming import stream_json
 
 # Download required NLTK data
 nltk.download('punkt')
@@ -32,6 +40,9 @@ nltk.download('words')
 app = Flask(__name__)
 load_dotenv()
 
+MAX_SITEMAP_WORKERS = 16
+MAX_SITEMAP_LIMIT = 50000
+
 def analyze_images(soup, base_url):
     images = soup.find_all('img')
     image_analysis = {
@@ -74,7 +85,8 @@ def analyze_links(soup, base_url):
         href = link.get('href')
         if href:
             absolute_url = urljoin(base_url, href)
-            if base_url in absolute_url:
+            is_internal = base_url in absolute_url
+            if is_internal:
                 link_analysis['internal_links'] += 1
             else:
                 link_analysis['external_links'] += 1
@@ -83,7 +95,8 @@ def analyze_links(soup, base_url):
             if link_text:
                 link_analysis['link_texts'].append({
                     'text': link_text,
-                    'url': absolute_url
+                    'url': absolute_url,
+                    'internal': is_internal
                 })
     
     return link_analysis
@@ -108,7 +121,7 @@ def analyze_content_quality(text_content):
     
     # Calculate unique word ratio
     unique_words = set(words)
-    unique_word_ratio = len(unique_words) / len(words)
+    unique_word_ratio = len(unique_words) / len(words) if words else 0
     
     # Analyze sentence complexity
     complex_sentences = sum(1 for s in sentences if len(nltk.word_tokenize(s)) > 20)
@@ -206,8 +219,8 @@ def calculate_overall_seo_score(data):
     print(f"Heading score: {heading_score}")
     technical_score += heading_score
     
-    # Readability score (convert from -1 to 1 scale to 0-100)
-    readability_score = ((data['readability_score'] + 1) / 2) * 100
+    # Readability score (Flesch reading ease, already on a 0-100 scale)
+    readability_score = data['readability_score']
     print(f"Readability score: {readability_score}")
     
     # Calculate weighted average
@@ -215,19 +228,23 @@ def calculate_overall_seo_score(data):
         performance_score * weights['performance'] +
         mobile_score * weights['mobile'] +
         content_score * weights['content'] +
-        technical_score * weights['technical'] +
-        readability_score * weights['readability']
+        technical_score * weights['technical']
     )
+    if readability_score is None:
+        # No scorable text: spread readability's weight over the other metrics
+        overall_score /= 1 - weights['readability']
+    else:
+        overall_score += readability_score * weights['readability']
     print(f"Overall score: {overall_score}")
     
     return round(overall_score, 1), content_score, technical_score
 
-def analyze_url(url):
+def analyze_url(url, include_sentiment=False):
     try:
         print(f"Starting analysis for URL: {url}")
-        start_time = time.time()
-        response = requests.get(url)
-        server_response_time = time.time() - start_time
+        response = fetch(url)
+        # Time until headers arrived, excluding rate-limit waits and retries
+        server_response_time = response.elapsed.total_seconds()
         print(f"Response status code: {response.status_code}")
         
         if response.status_code != 200:
@@ -244,23 +261,27 @@ def analyze_url(url):
         performance_analyzer = PerformanceAnalyzer(soup, response, server_response_time)
         performance = performance_analyzer.analyze()
         
+        # Head metadata and structured data analysis
+        print("Starting head analysis...")
+        head = HeadAnalyzer(soup).analyze()
+        
         # Mobile responsiveness analysis
         print("Starting mobile analysis...")
-        mobile_analyzer = MobileAnalyzer(soup)
+        mobile_analyzer = MobileAnalyzer(soup, head)
         mobile = mobile_analyzer.analyze()
         
         # Basic SEO analysis
-        title = soup.title.string if soup.title else "No title found"
+        title = head['title'] or "No title found"
         title_length = len(title) if title else 0
         print(f"Title length: {title_length}")
         
-        meta_description = soup.find('meta', {'name': 'description'})
-        meta_description = meta_description['content'] if meta_description else "No meta description found"
+        meta_description = head['meta_description'] or "No meta description found"
         meta_length = len(meta_description) if meta_description else 0
         print(f"Meta description length: {meta_length}")
         
-        # Get all text content
-        text_content = soup.get_text()
+        # Extract main-content text once, without scripts, navigation and banners
+        main_content = extract_main_content(soup)
+        text_content = main_content.pop('text')
         words = text_content.lower().split()
         word_count = len(words)
         print(f"Word count: {word_count}")
@@ -268,13 +289,23 @@ def analyze_url(url):
         # Keyword density analysis
         word_freq = Counter(words)
         keyword_density = {word: (count/word_count)*100 for word, count in word_freq.most_common(10)}
+        keywords = [
+            {'keyword': word, 'count': count, 'density': round((count/word_count)*100, 4)}
+            for word, count in word_freq.most_common()
+        ]
         print(f"Top keywords: {list(keyword_density.keys())[:5]}")
         
         # Readability analysis
-        blob = TextBlob(text_content)
-        readability_score = blob.sentiment.polarity
+        readability = ReadabilityAnalyzer(soup, text_content).analyze()
+        readability_score = readability['readability_score']
         print(f"Readability score: {readability_score}")
         
+        # Sentiment analysis is opt-in since TextBlob is expensive on large pages
+        sentiment = None
+        if include_sentiment:
+            print("Starting sentiment analysis...")
+            sentiment = SentimentAnalyzer(soup, text_content).analyze()
+        
         # URL structure analysis
         parsed_url = urlparse(url)
         url_structure = {
@@ -336,7 +367,10 @@ def analyze_url(url):
             'meta_length': meta_length,
             'word_count': word_count,
             'keyword_density': keyword_density,
+            'keywords': keywords,
             'readability_score': readability_score,
+            'readability': readability,
+            'sentiment': sentiment,
             'url': url,
             'url_length': len(url),
             'url_structure': url_structure,
@@ -344,9 +378,11 @@ def analyze_url(url):
             'link_analysis': link_analysis,
             'heading_analysis': heading_analysis,
             'content_quality': content_quality,
+            'main_content': main_content,
             'social_media': social_media,
             'performance': performance,
             'mobile': mobile,
+            'head': head,
             'overall_seo_score': overall_seo_score,
             'content_score': content_score,  # Include content score
             'technical_score': technical_score,  # Include technical score
@@ -396,6 +432,16 @@ def generate_pdf_report(data, url):
         elements.append(Paragraph(f"Status: {'Optimal' if 150 <= data['meta_length'] <= 160 else 'Could be improved'}", styles['Normal']))
         elements.append(Spacer(1, 20))
         
+        # Head Metadata
+        elements.append(Paragraph("Head Metadata", styles['Heading1']))
+        head_data = data['head']
+        elements.append(Paragraph(f"Canonical: {head_data['canonical'] or 'Not set'}", styles['Normal']))
+        elements.append(Paragraph(f"Hreflang Alternates: {len(head_data['hreflang'])}", styles['Normal']))
+        elements.append(Paragraph(f"Open Graph: {'Present' if head_data['open_graph'] else 'Not Found'}", styles['Normal']))
+        elements.append(Paragraph(f"Twitter Card: {'Present' if head_data['twitter_card'] else 'Not Found'}", styles['Normal']))
+        elements.append(Paragraph(f"Structured Data Types: {', '.join(head_data['schema_types']) or 'None'}", styles['Normal']))
+        elements.append(Spacer(1, 20))
+        
         # Content Statistics
         elements.append(Paragraph("Content Statistics", styles['Heading1']))
         elements.append(Paragraph(f"Word Count: {data['word_count']}", styles['Normal']))
@@ -406,8 +452,15 @@ def generate_pdf_report(data, url):
         
         # Readability Score
         elements.append(Paragraph("Readability Score", styles['Heading1']))
-        elements.append(Paragraph(f"Score: {data['readability_score']:.2f}", styles['Normal']))
-        elements.append(Paragraph(f"Status: {'Very Readable' if data['readability_score'] > 0.6 else 'Moderately Readable' if data['readability_score'] > 0.3 else 'Difficult to Read'}", styles['Normal']))
+        readability_data = data['readability']
+        if data['readability_score'] is None:
+            elements.append(Paragraph("Status: Not available (no readable text found)", styles['Normal']))
+        else:
+            elements.append(Paragraph(f"Flesch Reading Ease: {readability_data['flesch_reading_ease']:.1f}", styles['Normal']))
+            elements.append(Paragraph(f"Flesch-Kincaid Grade: {readability_data['flesch_kincaid_grade']:.1f}", styles['Normal']))
+            elements.append(Paragraph(f"Gunning Fog Index: {readability_data['gunning_fog']:.1f}", styles['Normal']))
+            elements.append(Paragraph(f"SMOG Index: {readability_data['smog_index']:.1f}", styles['Normal']))
+            elements.append(Paragraph(f"Status: {'Very Readable' if data['readability_score'] >= 60 else 'Moderately Readable' if data['readability_score'] >= 30 else 'Difficult to Read'}", styles['Normal']))
         elements.append(Spacer(1, 20))
         
         # Image Analysis
@@ -475,8 +528,25 @@ def analyze():
         if not url:
             return jsonify({'status': 'error', 'message': 'URL is required'})
         
-        results = analyze_url(url)
-        return jsonify(results)
+        store = get_result_store()
+        include_sentiment = bool(data.get('sentiment'))
+        
+        # Reuse a recent result from any worker instead of fetching the page again
+        result_id = None
+        if not data.get('refresh') and not include_sentiment:
+            result_id = store.find_recent(url, float(os.getenv('SEO_RESULT_CACHE_TTL', '300')))
+        summary = store.get_summary(result_id) if result_id else None
+        
+        if summary is None:
+            results = analyze_url(url, include_sentiment=include_sentiment)
+            if results.get('status') == 'error':
+                return jsonify(results)
+            
+            # Keep the full result server-side and return only the summary;
+            # detail lists are fetched page by page from /results/<result_id>/...
+            result_id = store.put(results)
+            summary = summarize_result(results, result_id)
+        return stream_json(summary, request.headers.get('Accept-Encoding', ''))
     except Exception as e:
         print(f"Error in analyze route: {str(e)}")
         return jsonify({
@@ -484,6 +554,201 @@ def analyze():
             'message': f'An error occurred: {str(e)}'
         })
 
+def _result_page(result_id, kind, **filters):
+    """Read one page of a stored detail list using the page/per_page/q query parameters."""
+    return get_result_store().page(
+        result_id, kind,
+        page=request.args.get('page', 1, type=int),
+        per_page=request.args.get('per_page', 50, type=int),
+        query=request.args.get('q', ''),
+        **filters
+    )
+
+def _stream_result_page(result_id, listing):
+    """Stream a page of detail items, or a 404 if the result expired."""
+    if listing is None:
+        return jsonify({'status': 'error', 'message': 'Result not found or expired'}), 404
+    response = {'status': 'success', 'result_id': result_id, **listing}
+    return stream_json(response, request.headers.get('Accept-Encoding', ''))
+
+@app.route('/results/<result_id>/links')
+def result_links(result_id):
+    try:
+        link_type = request.args.get('type')
+        flag = {'internal': 1, 'external': 0}.get(link_type)
+        return _stream_result_page(result_id, _result_page(result_id, 'links', flag=flag))
+    except Exception as e:
+        print(f"Error in result links route: {str(e)}")
+        return jsonify({
+            'status': 'error',
+            'message': f'An error occurred: {str(e)}'
+        })
+
+@app.route('/results/<result_id>/images')
+def result_images(result_id):
+    try:
+        if request.args.get('list') == 'sizes':
+            return _stream_result_page(result_id, _result_page(result_id, 'image_sizes'))
+        
+        listing = _result_page(result_id, 'missing_alt')
+        if listing is not None:
+            listing['items'] = [{'src': src} for src in listing['items']]
+        return _stream_result_page(result_id, listing)
+    except Exception as e:
+        print(f"Error in result images route: {str(e)}")
+        return jsonify({
+            'status': 'error',
+            'message': f'An error occurred: {str(e)}'
+        })
+
+@app.route('/results/<result_id>/keywords')
+def result_keywords(result_id):
+    try:
+        min_count = request.args.get('min_count', 1, type=int)
+        listing = _result_page(result_id, 'keywords', min_flag=min_count if min_count > 1 else None)
+        return _stream_result_page(result_id, listing)
+    except Exception as e:
+        print(f"Error in result keywords route: {str(e)}")
+        return jsonify({
+            'status': 'error',
+            'message': f'An error occurred: {str(e)}'
+        })
+
+@app.route('/analyze/head', methods=['POST'])
+def analyze_head():
+    try:
+        data = request.get_json()
+        url = data.get('url')
+        if not url:
+            return jsonify({'status': 'error', 'message': 'URL is required'})
+        
+        # Metadata-only audit: stop downloading as soon as </head> arrives
+        head_html, response = fetch_head(url)
+        if response.status_code != 200:
+            return jsonify({
+                'status': 'error',
+                'message': f'Failed to fetch URL. Status code: {response.status_code}'
+            })
+        
+        head = HeadAnalyzer.from_html(head_html).analyze()
+        return jsonify({'url': url, 'head': head, 'status': 'success'})
+    except requests.exceptions.RequestException as e:
+        return jsonify({
+            'status': 'error',
+            'message': f'Failed to fetch URL: {str(e)}'
+        })
+    except Exception as e:
+        print(f"Error in head analysis route: {str(e)}")
+        return jsonify({
+            'status': 'error',
+            'message': f'An error occurred: {str(e)}'
+        })
+
+def _positive_int_option(data, name, default, maximum):
+    """Read a positive integer option from a JSON body, capped at ``maximum``."""
+    value = data.get(name, default)
+    if value is None:
+        return None
+    try:
+        if isinstance(value, bool):
+            raise ValueError(value)
+        value = int(value)
+    except (TypeError, ValueError):
+        raise ValueError(f'{name} must be a positive integer')
+    if value < 1:
+        raise ValueError(f'{name} must be a positive integer')
+    return min(value, maximum)
+
+def _ingest_sitemap_in_background(*args, **kwargs):
+    try:
+        ingest_sitemap(*args, **kwargs)
+    except Exception as e:
+        # The error is also recorded on the batch for /batches/<batch_id>
+        print(f"Error in sitemap ingestion: {str(e)}")
+
+@app.route('/sitemap', methods=['POST'])
+def analyze_sitemap():
+    try:
+        data = request.get_json()
+        sitemap_url = data.get('url')
+        if not sitemap_url:
+            return jsonify({'status': 'error', 'message': 'Sitemap URL is required'})
+        
+        try:
+            workers = _positive_int_option(data, 'workers', 4, MAX_SITEMAP_WORKERS)
+            limit = _positive_int_option(data, 'limit', None, MAX_SITEMAP_LIMIT)
+        except ValueError as e:
+            return jsonify({'status': 'error', 'message': str(e)}), 400
+        
+        # Saving writes a full JSON file per page, so it is opt-in for sitemaps
+        on_result = None
+        if data.get('save'):
+            on_result = lambda url, result: save_analysis(url, result, 'Sitemap ingestion')
+        
+        # Ingestion runs in the background; poll /batches/<batch_id> for progress
+        store = get_shared_store()
+        batch_id = store.create_batch(sitemap_url)
+        Thread(
+            target=_ingest_sitemap_in_background,
+            args=(sitemap_url, analyze_url),
+            kwargs={
+                'on_result': on_result,
+                'workers': workers,
+                'limit': limit,
+                'store': store,
+                'batch_id': batch_id
+            },
+            daemon=True
+        ).start()
+        return jsonify({'status': 'success', 'batch_id': batch_id})
+    except Exception as e:
+        print(f"Error in sitemap route: {str(e)}")
+        return jsonify({
+            'status': 'error',
+            'message': f'Failed to ingest sitemap: {str(e)}'
+        })
+
+@app.route('/batches/<batch_id>')
+def batch_status(batch_id):
+    try:
+        summary = get_shared_store().batch_status(batch_id)
+        if summary is None:
+            return jsonify({'status': 'error', 'message': 'Batch not found'}), 404
+        return jsonify({'status': 'success', 'summary': summary})
+    except Exception as e:
+        print(f"Error in batch status route: {str(e)}")
+        return jsonify({
+            'status': 'error',
+            'message': f'Failed to read batch status: {str(e)}'
+        })
+
+@app.route('/batches/<batch_id>/join', methods=['POST'])
+def join_batch(batch_id):
+    # Lets another worker process help with a batch started elsewhere
+    try:
+        store = get_shared_store()
+        if store.batch_status(batch_id, max_errors=0) is None:
+            return jsonify({'status': 'error', 'message': 'Batch not found'}), 404
+        
+        data = request.get_json(silent=True) or {}
+        try:
+            workers = _positive_int_option(data, 'workers', 4, MAX_SITEMAP_WORKERS)
+        except ValueError as e:
+            return jsonify({'status': 'error', 'message': str(e)}), 400
+        
+        on_result = None
+        if data.get('save'):
+            on_result = lambda url, result: save_analysis(url, result, 'Sitemap ingestion')
+        for _ in range(workers):
+            Thread(target=run_worker, args=(store, batch_id, analyze_url, on_result), daemon=True).start()
+        return jsonify({'status': 'success', 'batch_id': batch_id, 'workers': workers})
+    except Exception as e:
+        print(f"Error in batch join route: {str(e)}")
+        return jsonify({
+            'status': 'error',
+            'message': f'Failed to join batch: {str(e)}'
+        })
+
 @app.route('/save', methods=['POST'])
 def save():
     try:
@@ -495,7 +760,14 @@ def save():
         if not url or not analysis_data:
             return jsonify({'status': 'error', 'message': 'URL and analysis data are required'})
         
+        # Save the full stored result rather than the summary the client holds
+        stored = get_result_store().get(analysis_data.get('result_id', ''))
+        if stored is not None:
+            analysis_data = stored
+        
         result = save_analysis(url, analysis_data, notes)
+        if result.get('status') == 'success':
+            get_shared_store().record_analysis(url)
         return jsonify(result)
     except Exception as e:
         return jsonify({
@@ -522,7 +794,10 @@ def export_report():
         if not url:
             return jsonify({'status': 'error', 'message': 'URL is required'})
         
-        results = analyze_url(url)
+        # Reuse the stored result when the client still has it, else re-analyze
+        results = get_result_store().get(data.get('result_id') or '')
+        if results is None:
+            results = analyze_url(url)
         if results.get('status') == 'error':
             return jsonify(results)
         
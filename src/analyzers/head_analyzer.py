@@ -0,0 +1,177 @@
+from typing import Dict, Any, List
+from bs4 import BeautifulSoup
+from .base_analyzer import BaseAnalyzer
+from src.utils.http_client import fetch
+import json
+import re
+
+HEAD_END = re.compile(r'</head\s*>', re.IGNORECASE)
+HEAD_END_BYTES = re.compile(rb'</head\s*>', re.IGNORECASE)
+MAX_HEAD_BYTES = 512 * 1024
+
+def extract_head_html(html: str) -> str:
+    """Return the document up to and including </head>, or all of it if there is none."""
+    match = HEAD_END.search(html)
+    return html[:match.end()] if match else html
+
+def fetch_head(url: str, chunk_size: int = 8192):
+    """Stream a page only until </head> has been received.
+
+    Returns the decoded head HTML and the response. The connection is
+    closed as soon as the head is complete, so the body is never downloaded.
+    """
+    response = fetch(url, stream=True)
+    try:
+        buffer = bytearray()
+        if response.status_code == 200:
+            for chunk in response.iter_content(chunk_size=chunk_size):
+                # Only rescan the tail that could contain a split "</head>"
+                search_from = max(0, len(buffer) - 16)
+                buffer.extend(chunk)
+                match = HEAD_END_BYTES.search(buffer, search_from)
+                if match:
+                    del buffer[match.end():]
+                    break
+                if len(buffer) >= MAX_HEAD_BYTES:
+                    break
+        encoding = response.encoding or 'utf-8'
+        return bytes(buffer).decode(encoding, errors='replace'), response
+    finally:
+        response.close()
+
+class HeadAnalyzer(BaseAnalyzer):
+    """Extracts head metadata and JSON-LD structured data in a single pass.
+
+    JSON-LD is collected from the whole document, since it is just as valid
+    in <body>; only analyzers built with ``from_html`` stop at </head>.
+    """
+
+    def __init__(self, soup: BeautifulSoup, head_only: bool = False):
+        super().__init__(soup)
+        self.head_only = head_only
+
+    @classmethod
+    def from_html(cls, html: str) -> 'HeadAnalyzer':
+        """Build an analyzer that parses only the head section of ``html``."""
+        return cls(BeautifulSoup(extract_head_html(html), 'html.parser'), head_only=True)
+
+    def analyze(self) -> Dict[str, Any]:
+        """Analyze title, meta tags, link relations, social cards and JSON-LD."""
+        if not self._validate_input():
+            return {'error': 'Invalid input data'}
+
+        results = {
+            'title': None,
+            'meta_description': None,
+            'viewport': None,
+            'robots': None,
+            'charset': None,
+            'canonical': None,
+            'hreflang': [],
+            'open_graph': {},
+            'twitter_card': {},
+            'json_ld': [],
+            'schema_types': [],
+            'json_ld_errors': 0
+        }
+
+        container = self.soup.head or self.soup
+        for tag in container.find_all(['title', 'meta', 'link']):
+            if tag.name == 'title':
+                if results['title'] is None:
+                    results['title'] = tag.get_text().strip()
+            elif tag.name == 'meta':
+                self._handle_meta(tag, results)
+            else:
+                self._handle_link(tag, results)
+
+        scripts = container if self.head_only else self.soup
+        for tag in scripts.find_all('script'):
+            if (tag.get('type') or '').lower() == 'application/ld+json':
+                self._handle_json_ld(tag, results)
+
+        results['recommendations'] = self._generate_recommendations(results)
+        return self._format_results(results)
+
+    def _handle_meta(self, tag, results: Dict[str, Any]) -> None:
+        """Record a <meta> tag under the matching result key."""
+        if tag.get('charset'):
+            results['charset'] = tag.get('charset')
+            return
+
+        name = (tag.get('name') or '').lower()
+        prop = (tag.get('property') or '').lower()
+        content = tag.get('content', '')
+
+        if name == 'description' and results['meta_description'] is None:
+            results['meta_description'] = content
+        elif name == 'viewport' and results['viewport'] is None:
+            results['viewport'] = content
+        elif name == 'robots':
+            results['robots'] = content
+        elif prop.startswith('og:'):
+            results['open_graph'].setdefault(prop[3:], content)
+        elif name.startswith('twitter:') or prop.startswith('twitter:'):
+            key = (name or prop)[len('twitter:'):]
+            results['twitter_card'].setdefault(key, content)
+
+    def _handle_link(self, tag, results: Dict[str, Any]) -> None:
+        """Record canonical and hreflang alternate links."""
+        rel = [value.lower() for value in (tag.get('rel') or [])]
+        href = tag.get('href')
+        if not href:
+            return
+        if 'canonical' in rel and results['canonical'] is None:
+            results['canonical'] = href
+        elif 'alternate' in rel and tag.get('hreflang'):
+            results['hreflang'].append({'hreflang': tag.get('hreflang'), 'href': href})
+
+    def _handle_json_ld(self, tag, results: Dict[str, Any]) -> None:
+        """Parse a JSON-LD block and collect its schema.org types."""
+        try:
+            data = json.loads(tag.string or '')
+        except ValueError:
+            results['json_ld_errors'] += 1
+            return
+
+        results['json_ld'].append(data)
+        for schema_type in self._collect_types(data):
+            if schema_type not in results['schema_types']:
+                results['schema_types'].append(schema_type)
+
+    def _collect_types(self, data) -> List[str]:
+        """Collect @type values from a JSON-LD document, including @graph items."""
+        types = []
+        if isinstance(data, list):
+            for item in data:
+                types.extend(self._collect_types(item))
+        elif isinstance(data, dict):
+            schema_type = data.get('@type')
+            if isinstance(schema_type, list):
+                types.extend(str(t) for t in schema_type)
+            elif schema_type:
+                types.append(str(schema_type))
+            if '@graph' in data:
+                types.extend(self._collect_types(data['@graph']))
+        return types
+
+    def _generate_recommendations(self, results: Dict[str, Any]) -> list:
+        """Generate recommendations for head metadata."""
+        recommendations = []
+
+        if not results['title']:
+            recommendations.append("Add a descriptive <title> tag")
+        if not results['meta_description']:
+            recommendations.append("Add a meta description")
+        if not results['canonical']:
+            recommendations.append("Add a canonical link to avoid duplicate content")
+        if not results['open_graph']:
+            recommendations.append("Add Open Graph tags for richer social sharing")
+        if not results['twitter_card']:
+            recommendations.append("Add Twitter card meta tags")
+        if not results['json_ld']:
+            recommendations.append("Add JSON-LD structured data to qualify for rich results")
+        if results['json_ld_errors']:
+            recommendations.append("Fix invalid JSON-LD blocks")
+
+        return recommendations
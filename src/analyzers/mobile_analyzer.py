@@ -1,10 +1,14 @@
-from typing import Dict, Any
+from typing import Dict, Any, Optional
 from .base_analyzer import BaseAnalyzer
 import re
 
 class MobileAnalyzer(BaseAnalyzer):
     """Analyzes mobile responsiveness of the website."""
     
+    def __init__(self, soup, head: Optional[Dict[str, Any]] = None):
+        super().__init__(soup)
+        self.head = head
+    
     def analyze(self) -> Dict[str, Any]:
         """Analyze mobile responsiveness metrics."""
         if not self._validate_input():
@@ -31,11 +35,15 @@ class MobileAnalyzer(BaseAnalyzer):
     
     def _check_viewport(self) -> str:
         """Check viewport meta tag configuration."""
-        viewport = self.soup.find('meta', {'name': 'viewport'})
-        if not viewport:
+        if self.head is not None:
+            # Reuse the viewport already extracted by the head analyzer
+            content = self.head.get('viewport')
+        else:
+            viewport = self.soup.find('meta', {'name': 'viewport'})
+            content = viewport.get('content', '') if viewport else None
+        if content is None:
             return 'not set'
             
-        content = viewport.get('content', '')
         if 'width=device-width' in content:
             return 'device-width'
         return 'custom'
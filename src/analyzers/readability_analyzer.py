@@ -0,0 +1,105 @@
+from typing import Dict, Any, Optional
+from functools import lru_cache
+from .base_analyzer import BaseAnalyzer
+import math
+import re
+
+# One regex drives the whole pass: group 1 is a word (any script), group 2 a sentence terminator
+TOKEN_PATTERN = re.compile(r"([^\W\d_]+(?:['’][^\W\d_]+)*)|([.!?。！？]+)")
+# Latin (including accented), Greek and Cyrillic vowels
+VOWEL_GROUPS = re.compile(r'[aeiouyàáâãäåæèéêëìíîïòóôõöøùúûüýÿœαεηιουωάέήίόύώаеёиоуыэюя]+')
+
+@lru_cache(maxsize=50000)
+def count_syllables(word: str) -> int:
+    """Estimate the number of syllables in a lowercase word."""
+    word = word.replace("'", '').replace('’', '')
+    if len(word) <= 3:
+        return 1
+    count = len(VOWEL_GROUPS.findall(word))
+    # Silent trailing "e" ("make"), but not "-le" endings ("table")
+    if word.endswith('e') and not word.endswith('le'):
+        count -= 1
+    if word.endswith('es') or word.endswith('ed'):
+        if not word.endswith(('ted', 'ded', 'ses', 'zes', 'ces', 'ges', 'xes')):
+            count -= 1
+    return max(1, count)
+
+class ReadabilityAnalyzer(BaseAnalyzer):
+    """Computes standard readability formulas in a single pass over the text."""
+
+    def __init__(self, soup, text_content: Optional[str] = None):
+        super().__init__(soup)
+        self.text_content = text_content
+
+    def analyze(self) -> Dict[str, Any]:
+        """Analyze readability metrics."""
+        if not self._validate_input():
+            return {'error': 'Invalid input data'}
+
+        text = self.text_content if self.text_content is not None else self.soup.get_text()
+        counts = self._count(text)
+
+        words = counts['words']
+        sentences = counts['sentences']
+        if not words:
+            # Nothing to score; None keeps an empty page from reading as "difficult"
+            results = {
+                'flesch_reading_ease': None,
+                'flesch_kincaid_grade': None,
+                'gunning_fog': None,
+                'smog_index': None,
+                'readability_score': None
+            }
+            results.update(counts)
+            return self._format_results(results)
+
+        words_per_sentence = words / sentences
+        syllables_per_word = counts['syllables'] / words
+
+        flesch_reading_ease = 206.835 - 1.015 * words_per_sentence - 84.6 * syllables_per_word
+        flesch_kincaid_grade = 0.39 * words_per_sentence + 11.8 * syllables_per_word - 15.59
+        gunning_fog = 0.4 * (words_per_sentence + 100 * counts['complex_words'] / words)
+        smog_index = 1.0430 * math.sqrt(counts['complex_words'] * (30 / sentences)) + 3.1291
+
+        results = {
+            'flesch_reading_ease': round(flesch_reading_ease, 2),
+            'flesch_kincaid_grade': round(flesch_kincaid_grade, 2),
+            'gunning_fog': round(gunning_fog, 2),
+            'smog_index': round(smog_index, 2),
+            # Flesch reading ease clamped to 0-100, higher is easier to read
+            'readability_score': round(max(0.0, min(100.0, flesch_reading_ease)), 2)
+        }
+        results.update(counts)
+        return self._format_results(results)
+
+    def _count(self, text: str) -> Dict[str, int]:
+        """Count words, sentences, syllables and complex words in one pass."""
+        words = 0
+        sentences = 0
+        syllables = 0
+        complex_words = 0
+        words_in_sentence = 0
+
+        for match in TOKEN_PATTERN.finditer(text):
+            word = match.group(1)
+            if word:
+                word_syllables = count_syllables(word.lower())
+                words += 1
+                words_in_sentence += 1
+                syllables += word_syllables
+                if word_syllables >= 3:
+                    complex_words += 1
+            elif words_in_sentence:
+                sentences += 1
+                words_in_sentence = 0
+
+        # Trailing text without a terminator still counts as a sentence
+        if words_in_sentence:
+            sentences += 1
+
+        return {
+            'words': words,
+            'sentences': sentences,
+            'syllables': syllables,
+            'complex_words': complex_words
+        }
@@ -0,0 +1,28 @@
+from typing import Dict, Any, Optional
+from .base_analyzer import BaseAnalyzer
+
+class SentimentAnalyzer(BaseAnalyzer):
+    """Optional sentiment analysis of the page text using TextBlob."""
+
+    def __init__(self, soup, text_content: Optional[str] = None):
+        super().__init__(soup)
+        self.text_content = text_content
+
+    def analyze(self) -> Dict[str, Any]:
+        """Analyze sentiment polarity and subjectivity."""
+        if not self._validate_input():
+            return {'error': 'Invalid input data'}
+
+        try:
+            # Imported lazily so TextBlob stays off the default analysis path
+            from textblob import TextBlob
+        except ImportError:
+            return {'error': 'TextBlob is not installed'}
+
+        text = self.text_content if self.text_content is not None else self.soup.get_text()
+        sentiment = TextBlob(text).sentiment
+        results = {
+            'polarity': round(sentiment.polarity, 4),
+            'subjectivity': round(sentiment.subjectivity, 4)
+        }
+        return self._format_results(results)
@@ -0,0 +1,211 @@
+from typing import Any, Callable, Dict, Optional
+from email.utils import parsedate_to_datetime
+from datetime import datetime, timezone
+from threading import Lock
+from urllib.parse import urlparse
+import os
+import random
+import time
+import requests
+from requests.adapters import HTTPAdapter
+from .shared_store import get_shared_store
+
+# urllib3 only decodes brotli when one of these packages is installed
+try:
+    import brotli  # noqa: F401
+    BROTLI_AVAILABLE = True
+except ImportError:
+    try:
+        import brotlicffi  # noqa: F401
+        BROTLI_AVAILABLE = True
+    except ImportError:
+        BROTLI_AVAILABLE = False
+
+DEFAULT_USER_AGENT = 'SEO-Sensei/1.0 (+https://github.com/Maleleee/SEO-Sensei)'
+RETRY_STATUSES = {429, 500, 502, 503, 504}
+
+class TokenBucket:
+    """Thread-safe token bucket allowing ``rate`` requests per second with bursts of ``capacity``."""
+
+    def __init__(self, rate: float, capacity: float):
+        self.rate = rate
+        self.capacity = capacity
+        self.tokens = capacity
+        self.updated = time.monotonic()
+        self.lock = Lock()
+
+    def _refill(self) -> None:
+        now = time.monotonic()
+        self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+        self.updated = now
+
+    def acquire(self) -> float:
+        """Take a token, sleeping until one is available. Returns the time waited."""
+        with self.lock:
+            self._refill()
+            # Reserve the token now so concurrent callers queue up fairly
+            self.tokens -= 1
+            wait = -self.tokens / self.rate if self.tokens < 0 else 0.0
+        if wait:
+            time.sleep(wait)
+        return wait
+
+    def penalize(self, delay: float) -> None:
+        """Hold off every caller for ``delay`` seconds, e.g. after a 429."""
+        with self.lock:
+            self._refill()
+            self.tokens = min(self.tokens, -delay * self.rate)
+
+class SharedTokenBucket:
+    """Token bucket for one host whose state lives in the shared store.
+
+    Every process on the host draws from the same budget, so workers that
+    join a batch do not multiply the request rate a site sees.
+    """
+
+    def __init__(self, store, host: str, rate: float, capacity: float):
+        self.store = store
+        self.host = host
+        self.interval = 1 / rate
+        self.capacity = capacity
+
+    def acquire(self) -> float:
+        """Reserve the next slot for the host, sleeping until it starts. Returns the time waited."""
+        start = self.store.reserve_host_slot(self.host, self.interval, self.capacity)
+        wait = max(0.0, start - time.time())
+        if wait:
+            time.sleep(wait)
+        return wait
+
+    def penalize(self, delay: float) -> None:
+        """Hold off every process for ``delay`` seconds, e.g. after a 429."""
+        self.store.hold_host(self.host, time.time() + delay, self.interval, self.capacity)
+
+def parse_retry_after(value: Optional[str]) -> Optional[float]:
+    """Parse a Retry-After header given either in seconds or as an HTTP date."""
+    if not value:
+        return None
+    value = value.strip()
+    if value.isdigit():
+        return float(value)
+    try:
+        retry_at = parsedate_to_datetime(value)
+    except (TypeError, ValueError):
+        return None
+    if retry_at.tzinfo is None:
+        retry_at = retry_at.replace(tzinfo=timezone.utc)
+    return max(0.0, (retry_at - datetime.now(timezone.utc)).total_seconds())
+
+class FetchClient:
+    """Shared HTTP client with connection pooling, per-host rate limits and retries.
+
+    Rate limits are kept in memory per client unless ``bucket_factory`` is
+    given; it is called with a host name and returns an object with
+    ``acquire()`` and ``penalize(delay)``, such as a ``SharedTokenBucket``.
+    """
+
+    def __init__(self,
+                 rate_per_host: float = 2.0,
+                 burst: float = 4.0,
+                 max_retries: int = 3,
+                 backoff_base: float = 0.5,
+                 max_backoff: float = 60.0,
+                 timeout: float = 30.0,
+                 pool_size: int = 20,
+                 user_agent: str = DEFAULT_USER_AGENT,
+                 bucket_factory: Optional[Callable[[str], Any]] = None):
+        self.rate_per_host = rate_per_host
+        self.burst = burst
+        self.max_retries = max_retries
+        self.backoff_base = backoff_base
+        self.max_backoff = max_backoff
+        self.timeout = timeout
+        self.bucket_factory = bucket_factory
+        self.buckets: Dict[str, Any] = {}
+        self.buckets_lock = Lock()
+
+        self.session = requests.Session()
+        adapter = HTTPAdapter(pool_connections=pool_size, pool_maxsize=pool_size)
+        self.session.mount('http://', adapter)
+        self.session.mount('https://', adapter)
+        self.session.headers.update({
+            'User-Agent': user_agent,
+            'Accept-Encoding': 'gzip, deflate, br' if BROTLI_AVAILABLE else 'gzip, deflate',
+            'Accept': 'text/html,application/xhtml+xml,application/xml;q=0.9,*/*;q=0.8'
+        })
+
+    def _bucket(self, url: str):
+        """Return the token bucket for the host of ``url``."""
+        host = urlparse(url).netloc.lower()
+        with self.buckets_lock:
+            bucket = self.buckets.get(host)
+            if bucket is None:
+                if self.bucket_factory:
+                    bucket = self.bucket_factory(host)
+                else:
+                    bucket = TokenBucket(self.rate_per_host, self.burst)
+                self.buckets[host] = bucket
+            return bucket
+
+    def _backoff(self, attempt: int) -> float:
+        """Exponential backoff with jitter for the given retry attempt."""
+        delay = self.backoff_base * (2 ** attempt)
+        return min(self.max_backoff, delay + random.uniform(0, delay / 2))
+
+    def get(self, url: str, **kwargs) -> requests.Response:
+        """GET ``url`` politely, retrying on 429/5xx and connection errors.
+
+        After the last attempt the final response is returned as-is, so
+        callers keep handling non-200 status codes themselves.
+        """
+        kwargs.setdefault('timeout', self.timeout)
+        bucket = self._bucket(url)
+
+        for attempt in range(self.max_retries + 1):
+            bucket.acquire()
+            try:
+                response = self.session.get(url, **kwargs)
+            except (requests.exceptions.ConnectionError, requests.exceptions.Timeout):
+                if attempt == self.max_retries:
+                    raise
+                time.sleep(self._backoff(attempt))
+                continue
+
+            if response.status_code not in RETRY_STATUSES or attempt == self.max_retries:
+                return response
+
+            retry_after = parse_retry_after(response.headers.get('Retry-After'))
+            delay = min(self.max_backoff, retry_after) if retry_after is not None else self._backoff(attempt)
+            print(f"Retrying {url} in {delay:.2f}s (status {response.status_code})")
+            response.close()
+            # Other workers (and processes, with shared buckets) fetching the same host back off as well
+            bucket.penalize(delay)
+
+_client = None
+_client_lock = Lock()
+
+def get_client() -> FetchClient:
+    """Return the process-wide fetch client, configured from the environment.
+
+    Its per-host rate limits are kept in the shared store, so the limit holds
+    for all worker processes of the host together rather than for each one.
+    """
+    global _client
+    with _client_lock:
+        if _client is None:
+            rate = float(os.getenv('SEO_RATE_LIMIT', '2.0'))
+            burst = float(os.getenv('SEO_RATE_BURST', '4.0'))
+            store = get_shared_store()
+            _client = FetchClient(
+                rate_per_host=rate,
+                burst=burst,
+                max_retries=int(os.getenv('SEO_MAX_RETRIES', '3')),
+                timeout=float(os.getenv('SEO_FETCH_TIMEOUT', '30')),
+                user_agent=os.getenv('SEO_USER_AGENT', DEFAULT_USER_AGENT),
+                bucket_factory=lambda host: SharedTokenBucket(store, host, rate, burst)
+            )
+        return _client
+
+def fetch(url: str, **kwargs) -> requests.Response:
+    """Fetch ``url`` through the shared client."""
+    return get_client().get(url, **kwargs)
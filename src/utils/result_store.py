@@ -0,0 +1,111 @@
+from typing import Dict, Any, Optional, Tuple
+from threading import Lock
+from .shared_store import SharedStore, get_shared_store
+
+# Detail lists that are served page by page instead of inside /analyze,
+# keyed by list name: (result section or None for top level, field)
+DETAIL_LISTS = {
+    'links': ('link_analysis', 'link_texts'),
+    'missing_alt': ('image_analysis', 'missing_alt_texts'),
+    'image_sizes': ('image_analysis', 'image_sizes'),
+    'keywords': (None, 'keywords')
+}
+MAX_PER_PAGE = 500
+
+def _index_item(kind: str, item: Any) -> Tuple[str, Optional[int]]:
+    """Return the lowercase search text and the numeric flag a list item is filtered on."""
+    if kind == 'links':
+        return f"{item['text']}\n{item['url']}".lower(), int(bool(item.get('internal')))
+    if kind == 'missing_alt':
+        return (item or '').lower(), None
+    if kind == 'image_sizes':
+        return (item.get('src') or '').lower(), None
+    return item['keyword'], item['count']
+
+class ResultStore:
+    """Analysis results keyed by result ID, shared by all worker processes.
+
+    The summary is stored as one document and every detail list item as its
+    own row, so a page of links or keywords is filtered and sliced by SQLite
+    without decoding the rest of the result.
+    """
+
+    def __init__(self, shared_store: SharedStore):
+        self.shared_store = shared_store
+
+    def put(self, result: Dict[str, Any], result_id: Optional[str] = None) -> str:
+        """Store a full result and return its ID, generating one unless given."""
+        summary = summarize_result(result)
+        items = {}
+        for kind, (section, field) in DETAIL_LISTS.items():
+            container = result.get(section, {}) if section else result
+            values = container.get(field) or []
+            items[kind] = [_index_item(kind, value) + (value,) for value in values]
+        return self.shared_store.put_result(summary, items, result_id)
+
+    def get_summary(self, result_id: str) -> Optional[Dict[str, Any]]:
+        """Return a stored result without its detail lists, or None if it is unknown or was evicted."""
+        summary = self.shared_store.get_result(result_id)
+        if summary is not None:
+            summary['result_id'] = result_id
+        return summary
+
+    def get(self, result_id: str) -> Optional[Dict[str, Any]]:
+        """Return a stored result with its detail lists reassembled."""
+        result = self.shared_store.get_result(result_id)
+        if result is None:
+            return None
+        for kind, (section, field) in DETAIL_LISTS.items():
+            if section and section not in result:
+                continue
+            container = result[section] if section else result
+            container[field] = self.shared_store.get_result_items(result_id, kind)
+        return result
+
+    def page(self, result_id: str, kind: str, page: int = 1, per_page: int = 50,
+             query: str = '', flag: Optional[int] = None,
+             min_flag: Optional[int] = None) -> Optional[Dict[str, Any]]:
+        """Return one filtered page of a detail list and its pagination state."""
+        per_page = max(1, min(per_page, MAX_PER_PAGE))
+        found = self.shared_store.page_result_items(
+            result_id, kind, page, per_page, query.lower(), flag, min_flag
+        )
+        if found is None:
+            return None
+        items, total, page = found
+        return {
+            'items': items,
+            'page': page,
+            'per_page': per_page,
+            'total': total,
+            'pages': max(1, (total + per_page - 1) // per_page)
+        }
+
+    def find_recent(self, url: str, max_age: float) -> Optional[str]:
+        """Return the ID of a result for ``url`` at most ``max_age`` seconds old."""
+        if max_age <= 0:
+            return None
+        return self.shared_store.find_recent_result(url, max_age)
+
+def summarize_result(result: Dict[str, Any], result_id: Optional[str] = None) -> Dict[str, Any]:
+    """Return a copy of ``result`` without its large detail lists."""
+    summary = dict(result)
+    for section, field in DETAIL_LISTS.values():
+        if section is None:
+            summary.pop(field, None)
+        elif section in summary:
+            summary[section] = {k: v for k, v in summary[section].items() if k != field}
+    if result_id is not None:
+        summary['result_id'] = result_id
+    return summary
+
+_store = None
+_store_lock = Lock()
+
+def get_result_store() -> ResultStore:
+    """Return the process-wide result store."""
+    global _store
+    with _store_lock:
+        if _store is None:
+            _store = ResultStore(get_shared_store())
+        return _store
@@ -0,0 +1,530 @@
+from typing import Dict, Any, Callable, Iterable, List, Optional, Tuple
+from pathlib import Path
+from threading import Event, Lock, Thread, local
+import json
+import os
+import socket
+import sqlite3
+import time
+import uuid
+
+# Reads refresh a result's LRU timestamp at most this often
+TOUCH_INTERVAL = 60
+# A batch whose producer has not renewed its lease for this long is treated as fully enqueued
+PRODUCER_LEASE = 60
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS results (
+    id TEXT PRIMARY KEY,
+    url TEXT,
+    data TEXT NOT NULL,
+    created REAL NOT NULL,
+    accessed REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_results_url ON results (url, created);
+CREATE INDEX IF NOT EXISTS idx_results_accessed ON results (accessed);
+
+CREATE TABLE IF NOT EXISTS result_items (
+    result_id TEXT NOT NULL REFERENCES results (id) ON DELETE CASCADE,
+    kind TEXT NOT NULL,
+    position INTEGER NOT NULL,
+    search TEXT NOT NULL DEFAULT '',
+    flag INTEGER,
+    data TEXT NOT NULL,
+    PRIMARY KEY (result_id, kind, position)
+) WITHOUT ROWID;
+
+CREATE TABLE IF NOT EXISTS analyzed_pages (
+    url TEXT PRIMARY KEY,
+    analyzed REAL NOT NULL
+) WITHOUT ROWID;
+
+CREATE TABLE IF NOT EXISTS host_limits (
+    host TEXT PRIMARY KEY,
+    tat REAL NOT NULL
+) WITHOUT ROWID;
+
+CREATE TABLE IF NOT EXISTS batches (
+    id TEXT PRIMARY KEY,
+    source TEXT,
+    enqueuing INTEGER NOT NULL DEFAULT 1,
+    producer_expires REAL,
+    error TEXT,
+    discovered INTEGER NOT NULL DEFAULT 0,
+    unchanged INTEGER NOT NULL DEFAULT 0,
+    limit_reached INTEGER NOT NULL DEFAULT 0,
+    created REAL NOT NULL
+);
+
+CREATE TABLE IF NOT EXISTS jobs (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    batch_id TEXT NOT NULL,
+    url TEXT NOT NULL,
+    status TEXT NOT NULL DEFAULT 'pending',
+    attempts INTEGER NOT NULL DEFAULT 0,
+    lease_owner TEXT,
+    lease_expires REAL,
+    result_id TEXT,
+    error TEXT,
+    updated REAL NOT NULL,
+    UNIQUE (batch_id, url)
+);
+CREATE INDEX IF NOT EXISTS idx_jobs_claim ON jobs (batch_id, status, id);
+"""
+
+def make_worker_id() -> str:
+    """Identify a worker uniquely across hosts and processes."""
+    return f'{socket.gethostname()}:{os.getpid()}:{uuid.uuid4().hex[:8]}'
+
+class Heartbeat:
+    """Calls ``beat`` every ``interval`` seconds in a background thread while in use.
+
+        with Heartbeat(lambda: store.renew_job(job_id, worker_id), 100):
+            analyze(url)
+    """
+
+    def __init__(self, beat: Callable[[], Any], interval: float):
+        self.beat = beat
+        self.interval = interval
+        self._stopped = Event()
+        self._thread = Thread(target=self._run, daemon=True)
+
+    def _run(self) -> None:
+        while not self._stopped.wait(self.interval):
+            try:
+                self.beat()
+            except Exception as e:
+                print(f"Heartbeat failed: {str(e)}")
+
+    def __enter__(self) -> 'Heartbeat':
+        self._thread.start()
+        return self
+
+    def __exit__(self, exc_type, exc, tb) -> None:
+        self._stopped.set()
+        self._thread.join()
+
+class SharedStore:
+    """SQLite (WAL mode) store shared by the worker processes of one host.
+
+    WAL needs shared memory and working file locks, so the database must be
+    on a local disk; it is not safe on NFS or other network filesystems.
+
+    Holds stored analysis results and a durable job queue. Jobs are claimed
+    under a time-limited lease inside an IMMEDIATE transaction, so each job
+    is handed to exactly one worker; jobs whose lease expires (e.g. the
+    worker crashed) become claimable again until ``max_attempts`` is reached.
+    The producer of a batch holds a lease too: if it crashes mid-enqueue the
+    batch counts as fully enqueued once the lease expires, so its workers
+    finish instead of waiting forever.
+    """
+
+    def __init__(self, path: str, max_results: int = 1000, max_attempts: int = 3):
+        self.path = path
+        self.max_results = max_results
+        self.max_attempts = max_attempts
+        self._local = local()
+        Path(path).parent.mkdir(parents=True, exist_ok=True)
+        conn = self._connection()
+        conn.executescript(SCHEMA)
+
+    def _connection(self) -> sqlite3.Connection:
+        """Return this thread's connection, opening it on first use."""
+        conn = getattr(self._local, 'conn', None)
+        if conn is None:
+            conn = sqlite3.connect(self.path, timeout=30, isolation_level=None)
+            conn.row_factory = sqlite3.Row
+            conn.execute('PRAGMA journal_mode=WAL')
+            conn.execute('PRAGMA synchronous=NORMAL')
+            conn.execute('PRAGMA busy_timeout=30000')
+            conn.execute('PRAGMA foreign_keys=ON')
+            self._local.conn = conn
+        return conn
+
+    # Results
+
+    def put_result(self, summary: Dict[str, Any],
+                   items: Optional[Dict[str, Iterable[Tuple[str, Optional[int], Any]]]] = None,
+                   result_id: Optional[str] = None) -> str:
+        """Store a result summary and its detail lists, returning its ID.
+
+        ``items`` maps a list name to ``(search, flag, item)`` tuples; each item
+        becomes its own row so pages can be filtered and sliced in SQL.
+        """
+        result_id = result_id or uuid.uuid4().hex
+        now = time.time()
+        conn = self._connection()
+        conn.execute('BEGIN IMMEDIATE')
+        try:
+            conn.execute(
+                'INSERT INTO results (id, url, data, created, accessed) VALUES (?, ?, ?, ?, ?)',
+                (result_id, summary.get('url'), json.dumps(summary), now, now)
+            )
+            for kind, rows in (items or {}).items():
+                conn.executemany(
+                    'INSERT INTO result_items (result_id, kind, position, search, flag, data) '
+                    'VALUES (?, ?, ?, ?, ?, ?)',
+                    ((result_id, kind, position, search, flag, json.dumps(item))
+                     for position, (search, flag, item) in enumerate(rows))
+                )
+            # Evict least recently used results (and their items) beyond the configured limit
+            conn.execute(
+                'DELETE FROM results WHERE id IN ('
+                'SELECT id FROM results ORDER BY accessed DESC LIMIT -1 OFFSET ?)',
+                (self.max_results,)
+            )
+            conn.execute('COMMIT')
+        except Exception:
+            conn.execute('ROLLBACK')
+            raise
+        return result_id
+
+    def _touch_result(self, result_id: str, accessed: float) -> None:
+        """Refresh a result's LRU timestamp unless it was refreshed recently."""
+        now = time.time()
+        if now - accessed >= TOUCH_INTERVAL:
+            self._connection().execute('UPDATE results SET accessed = ? WHERE id = ?', (now, result_id))
+
+    def get_result(self, result_id: str) -> Optional[Dict[str, Any]]:
+        """Return a stored result summary, or None if it is unknown or was evicted."""
+        row = self._connection().execute(
+            'SELECT data, accessed FROM results WHERE id = ?', (result_id,)
+        ).fetchone()
+        if row is None:
+            return None
+        self._touch_result(result_id, row['accessed'])
+        return json.loads(row['data'])
+
+    def get_result_items(self, result_id: str, kind: str) -> List[Any]:
+        """Return every item of one detail list of a result, in stored order."""
+        return [
+            json.loads(row['data'])
+            for row in self._connection().execute(
+                'SELECT data FROM result_items WHERE result_id = ? AND kind = ? ORDER BY position',
+                (result_id, kind))
+        ]
+
+    def page_result_items(self, result_id: str, kind: str, page: int, per_page: int,
+                          query: str = '', flag: Optional[int] = None,
+                          min_flag: Optional[int] = None) -> Optional[Tuple[List[Any], int, int]]:
+        """Return one filtered page of a detail list as ``(items, total, page)``.
+
+        ``query`` must occur in an item's search text and ``flag``/``min_flag``
+        match its flag exactly or as a lower bound. ``page`` is clamped to the
+        last page. Returns None if the result is unknown or was evicted.
+        """
+        conn = self._connection()
+        row = conn.execute('SELECT accessed FROM results WHERE id = ?', (result_id,)).fetchone()
+        if row is None:
+            return None
+        self._touch_result(result_id, row['accessed'])
+
+        where = 'result_id = ? AND kind = ?'
+        args = [result_id, kind]
+        if query:
+            where += ' AND instr(search, ?) > 0'
+            args.append(query)
+        if flag is not None:
+            where += ' AND flag = ?'
+            args.append(flag)
+        if min_flag is not None:
+            where += ' AND flag >= ?'
+            args.append(min_flag)
+
+        total = conn.execute(f'SELECT COUNT(*) FROM result_items WHERE {where}', args).fetchone()[0]
+        pages = max(1, (total + per_page - 1) // per_page)
+        page = max(1, min(page, pages))
+        items = [
+            json.loads(item['data'])
+            for item in conn.execute(
+                f'SELECT data FROM result_items WHERE {where} ORDER BY position LIMIT ? OFFSET ?',
+                args + [per_page, (page - 1) * per_page])
+        ]
+        return items, total, page
+
+    def find_recent_result(self, url: str, max_age: float) -> Optional[str]:
+        """Return the ID of a result for ``url`` newer than ``max_age`` seconds."""
+        row = self._connection().execute(
+            'SELECT id FROM results WHERE url = ? AND created >= ? ORDER BY created DESC LIMIT 1',
+            (url, time.time() - max_age)
+        ).fetchone()
+        return row['id'] if row else None
+
+    # Last analysis time per URL, used to schedule sitemap entries by lastmod
+
+    def record_analysis(self, url: str, analyzed: Optional[float] = None) -> None:
+        """Remember that ``url`` was analyzed at ``analyzed`` (default: now)."""
+        self._connection().execute(
+            'INSERT INTO analyzed_pages (url, analyzed) VALUES (?, ?) '
+            'ON CONFLICT (url) DO UPDATE SET analyzed = max(analyzed, excluded.analyzed)',
+            (url, analyzed if analyzed is not None else time.time())
+        )
+
+    def last_analyzed(self, url: str) -> Optional[float]:
+        """Return when ``url`` was last analyzed as a Unix timestamp, or None."""
+        row = self._connection().execute(
+            'SELECT analyzed FROM analyzed_pages WHERE url = ?', (url,)
+        ).fetchone()
+        return row['analyzed'] if row else None
+
+    # Per-host request budget shared by every process
+
+    def reserve_host_slot(self, host: str, interval: float, burst: float) -> float:
+        """Reserve the next request slot for ``host`` and return the Unix time it may start.
+
+        A generic cell rate algorithm: each request moves the host's
+        theoretical arrival time on by ``interval``, and up to ``burst``
+        requests may start ahead of it.
+        """
+        conn = self._connection()
+        conn.execute('BEGIN IMMEDIATE')
+        try:
+            now = time.time()
+            row = conn.execute('SELECT tat FROM host_limits WHERE host = ?', (host,)).fetchone()
+            tat = max(row['tat'], now) if row else now
+            conn.execute(
+                'INSERT OR REPLACE INTO host_limits (host, tat) VALUES (?, ?)', (host, tat + interval)
+            )
+            conn.execute('COMMIT')
+        except Exception:
+            conn.execute('ROLLBACK')
+            raise
+        return max(now, tat - max(0.0, burst - 1) * interval)
+
+    def hold_host(self, host: str, until: float, interval: float, burst: float) -> None:
+        """Let no request to ``host`` start before the Unix time ``until``, e.g. after a 429."""
+        self._connection().execute(
+            'INSERT INTO host_limits (host, tat) VALUES (?, ?) '
+            'ON CONFLICT (host) DO UPDATE SET tat = max(tat, excluded.tat)',
+            (host, until + max(0.0, burst - 1) * interval)
+        )
+
+    # Batches and jobs
+
+    def create_batch(self, source: str) -> str:
+        """Register a new batch and return its ID."""
+        batch_id = uuid.uuid4().hex
+        now = time.time()
+        self._connection().execute(
+            'INSERT INTO batches (id, source, producer_expires, created) VALUES (?, ?, ?, ?)',
+            (batch_id, source, now + PRODUCER_LEASE, now)
+        )
+        return batch_id
+
+    def renew_batch(self, batch_id: str, lease_seconds: float = PRODUCER_LEASE) -> None:
+        """Extend the producer lease of a batch that is still being enqueued."""
+        self._connection().execute(
+            'UPDATE batches SET producer_expires = ? WHERE id = ?', (time.time() + lease_seconds, batch_id)
+        )
+
+    def enqueue(self, batch_id: str, urls: Iterable[str]) -> int:
+        """Add URLs to a batch in one transaction, ignoring duplicates. Returns the number added."""
+        now = time.time()
+        conn = self._connection()
+        conn.execute('BEGIN IMMEDIATE')
+        try:
+            before = conn.total_changes
+            conn.executemany(
+                'INSERT OR IGNORE INTO jobs (batch_id, url, updated) VALUES (?, ?, ?)',
+                ((batch_id, url, now) for url in urls)
+            )
+            added = conn.total_changes - before
+            conn.execute('COMMIT')
+        except Exception:
+            conn.execute('ROLLBACK')
+            raise
+        return added
+
+    def update_batch(self, batch_id: str, discovered: int = 0, unchanged: int = 0,
+                     enqueuing: Optional[bool] = None, error: Optional[str] = None,
+                     limit_reached: Optional[bool] = None) -> None:
+        """Add to a batch's discovery counters and optionally set its enqueuing, error and limit flags."""
+        conn = self._connection()
+        conn.execute(
+            'UPDATE batches SET discovered = discovered + ?, unchanged = unchanged + ? WHERE id = ?',
+            (discovered, unchanged, batch_id)
+        )
+        if enqueuing is not None:
+            conn.execute('UPDATE batches SET enqueuing = ? WHERE id = ?', (int(enqueuing), batch_id))
+        if error is not None:
+            conn.execute('UPDATE batches SET error = ? WHERE id = ?', (error, batch_id))
+        if limit_reached is not None:
+            conn.execute('UPDATE batches SET limit_reached = ? WHERE id = ?', (int(limit_reached), batch_id))
+
+    def claim_job(self, worker_id: str, batch_id: Optional[str] = None,
+                  lease_seconds: float = 300) -> Optional[Dict[str, Any]]:
+        """Atomically lease the next pending (or abandoned) job to ``worker_id``."""
+        now = time.time()
+        batch_filter = 'batch_id = ? AND ' if batch_id else ''
+        batch_args = (batch_id,) if batch_id else ()
+        conn = self._connection()
+        conn.execute('BEGIN IMMEDIATE')
+        try:
+            # Abandoned jobs that already used up their attempts are given up on
+            conn.execute(
+                f"UPDATE jobs SET status = 'failed', error = 'Lease expired', updated = ? "
+                f"WHERE {batch_filter}status = 'running' AND lease_expires < ? AND attempts >= ?",
+                (now,) + batch_args + (now, self.max_attempts)
+            )
+            row = conn.execute(
+                f"SELECT id, batch_id, url, attempts FROM jobs WHERE {batch_filter}"
+                f"(status = 'pending' OR (status = 'running' AND lease_expires < ?)) "
+                f"ORDER BY id LIMIT 1",
+                batch_args + (now,)
+            ).fetchone()
+            if row is None:
+                conn.execute('COMMIT')
+                return None
+            conn.execute(
+                "UPDATE jobs SET status = 'running', lease_owner = ?, lease_expires = ?, "
+                "attempts = attempts + 1, updated = ? WHERE id = ?",
+                (worker_id, now + lease_seconds, now, row['id'])
+            )
+            conn.execute('COMMIT')
+        except Exception:
+            conn.execute('ROLLBACK')
+            raise
+        job = dict(row)
+        job['attempts'] += 1
+        return job
+
+    def renew_job(self, job_id: int, worker_id: str, lease_seconds: float = 300) -> bool:
+        """Extend a running job's lease. Returns False if the lease was lost to another worker."""
+        now = time.time()
+        cursor = self._connection().execute(
+            "UPDATE jobs SET lease_expires = ?, updated = ? "
+            "WHERE id = ? AND lease_owner = ? AND status = 'running'",
+            (now + lease_seconds, now, job_id, worker_id)
+        )
+        return cursor.rowcount == 1
+
+    def complete_job(self, job_id: int, worker_id: str, result_id: Optional[str] = None) -> bool:
+        """Mark a leased job done. Returns False if the lease was lost to another worker."""
+        cursor = self._connection().execute(
+            "UPDATE jobs SET status = 'done', result_id = ?, lease_owner = NULL, updated = ? "
+            "WHERE id = ? AND lease_owner = ? AND status = 'running'",
+            (result_id, time.time(), job_id, worker_id)
+        )
+        return cursor.rowcount == 1
+
+    def fail_job(self, job_id: int, worker_id: str, error: str, retry: bool = True) -> bool:
+        """Release a failed job for retry, or mark it failed after ``max_attempts``."""
+        max_attempts = self.max_attempts if retry else 0
+        cursor = self._connection().execute(
+            "UPDATE jobs SET status = CASE WHEN attempts >= ? THEN 'failed' ELSE 'pending' END, "
+            "error = ?, lease_owner = NULL, lease_expires = NULL, updated = ? "
+            "WHERE id = ? AND lease_owner = ? AND status = 'running'",
+            (max_attempts, error, time.time(), job_id, worker_id)
+        )
+        return cursor.rowcount == 1
+
+    def batch_status(self, batch_id: str, max_errors: int = 20) -> Optional[Dict[str, Any]]:
+        """Summarize a batch: discovery counters, job counts by status, the producer error and recent job errors."""
+        conn = self._connection()
+        batch = conn.execute('SELECT * FROM batches WHERE id = ?', (batch_id,)).fetchone()
+        if batch is None:
+            return None
+        # A producer that stopped renewing its lease crashed; nothing more will be enqueued
+        producer_lost = bool(batch['enqueuing']) and (batch['producer_expires'] or 0) < time.time()
+        enqueuing = bool(batch['enqueuing']) and not producer_lost
+
+        counts = {'pending': 0, 'running': 0, 'done': 0, 'failed': 0}
+        for row in conn.execute(
+                'SELECT status, COUNT(*) AS n FROM jobs WHERE batch_id = ? GROUP BY status', (batch_id,)):
+            counts[row['status']] = row['n']
+        errors = [
+            {'url': row['url'], 'message': row['error']}
+            for row in conn.execute(
+                "SELECT url, error FROM jobs WHERE batch_id = ? AND status = 'failed' ORDER BY id LIMIT ?",
+                (batch_id, max_errors))
+        ]
+
+        return {
+            'batch_id': batch_id,
+            'source': batch['source'],
+            'enqueuing': enqueuing,
+            'producer_lost': producer_lost,
+            'finished': not enqueuing and counts['pending'] == 0 and counts['running'] == 0,
+            'discovered': batch['discovered'],
+            'scheduled': sum(counts.values()),
+            'unchanged': batch['unchanged'],
+            'limit_reached': bool(batch['limit_reached']),
+            'pending': counts['pending'],
+            'running': counts['running'],
+            'analyzed': counts['done'],
+            'failed': counts['failed'],
+            'error': batch['error'],
+            'errors': errors
+        }
+
+def run_worker(store: SharedStore,
+               batch_id: str,
+               analyze_fn: Callable[[str], Dict[str, Any]],
+               on_result: Optional[Callable[[str, Dict[str, Any]], None]] = None,
+               lease_seconds: float = 300,
+               poll_interval: float = 0.5,
+               idle_timeout: Optional[float] = 600) -> int:
+    """Claim and analyze jobs of a batch until it is finished. Returns the number processed.
+
+    Any number of these may run in any process sharing the store. When no
+    job is claimable but the batch is not finished, the worker waits for
+    more jobs to be enqueued or for abandoned leases to expire. The lease
+    of the job being analyzed is renewed every third of ``lease_seconds``,
+    so slow pages are not handed to a second worker while still running.
+    The worker gives up after ``idle_timeout`` seconds without a claimable
+    job (None waits until the batch is finished).
+    """
+    # Imported here because result_store builds on this module
+    from .result_store import ResultStore
+
+    worker_id = make_worker_id()
+    processed = 0
+    idle_since = None
+    while True:
+        job = store.claim_job(worker_id, batch_id, lease_seconds)
+        if job is None:
+            status = store.batch_status(batch_id, max_errors=0)
+            if status is None or status['finished']:
+                return processed
+            idle_since = idle_since or time.monotonic()
+            if idle_timeout is not None and time.monotonic() - idle_since >= idle_timeout:
+                print(f"Worker {worker_id} leaving idle batch {batch_id}")
+                return processed
+            time.sleep(poll_interval)
+            continue
+        idle_since = None
+
+        try:
+            renew = lambda: store.renew_job(job['id'], worker_id, lease_seconds)
+            with Heartbeat(renew, lease_seconds / 3):
+                result = analyze_fn(job['url'])
+            if result.get('status') == 'success':
+                # Only the worker still holding the lease stores and reports the
+                # result, so a job reclaimed by another worker is never saved twice
+                result_id = uuid.uuid4().hex
+                if store.complete_job(job['id'], worker_id, result_id):
+                    ResultStore(store).put(result, result_id)
+                    store.record_analysis(job['url'])
+                    if on_result:
+                        on_result(job['url'], result)
+            else:
+                # The fetch client already retried transient errors
+                store.fail_job(job['id'], worker_id, result.get('message', 'Analysis failed'), retry=False)
+        except Exception as e:
+            store.fail_job(job['id'], worker_id, str(e))
+        processed += 1
+
+_store = None
+_store_lock = Lock()
+
+def get_shared_store() -> SharedStore:
+    """Return this process's handle on the shared store, configured from the environment."""
+    global _store
+    with _store_lock:
+        if _store is None:
+            _store = SharedStore(
+                os.getenv('SEO_STORE_PATH', 'storage/seo.db'),
+                max_results=int(os.getenv('SEO_MAX_STORED_RESULTS', '1000')),
+                max_attempts=int(os.getenv('SEO_JOB_MAX_ATTEMPTS', '3'))
+            )
+        return _store
@@ -0,0 +1,166 @@
+from typing import Dict, Any, Callable, Iterator, Optional
+from contextlib import closing
+from datetime import datetime
+from threading import Thread
+import gzip
+import io
+import xml.etree.ElementTree as ET
+from .http_client import fetch
+from .shared_store import PRODUCER_LEASE, Heartbeat, SharedStore, get_shared_store, run_worker
+
+GZIP_MAGIC = b'\x1f\x8b'
+MAX_INDEX_DEPTH = 3
+ENQUEUE_CHUNK = 500
+
+def _local_name(tag: str) -> str:
+    """Strip the XML namespace from a tag name."""
+    return tag.rsplit('}', 1)[-1]
+
+def parse_lastmod(value: Optional[str]) -> Optional[datetime]:
+    """Parse a W3C datetime lastmod value into a naive local datetime."""
+    if not value:
+        return None
+    value = value.strip()
+    if value.endswith('Z'):
+        value = value[:-1] + '+00:00'
+    try:
+        parsed = datetime.fromisoformat(value)
+    except ValueError:
+        return None
+    if parsed.tzinfo is not None:
+        parsed = parsed.astimezone().replace(tzinfo=None)
+    return parsed
+
+def open_sitemap_stream(sitemap_url: str):
+    """Open a sitemap URL as a file-like byte stream, transparently gunzipping it."""
+    response = fetch(sitemap_url, stream=True)
+    response.raise_for_status()
+    response.raw.decode_content = True
+    # Keep the raw stream usable by BufferedReader after the body hits EOF
+    response.raw.auto_close = False
+    stream = io.BufferedReader(response.raw)
+    # Sitemaps served as .xml.gz are gzip files, not gzip transfer encoding
+    if stream.peek(2)[:2] == GZIP_MAGIC:
+        return gzip.GzipFile(fileobj=stream), response
+    return stream, response
+
+def iter_sitemap_entries(source, depth: int = 0) -> Iterator[Dict[str, Any]]:
+    """Stream <url> entries from a sitemap or sitemap index.
+
+    ``source`` is either a URL or a file-like object. Elements are cleared
+    as soon as they are consumed, so memory stays constant regardless of
+    the number of entries in a shard.
+    """
+    response = None
+    if isinstance(source, str):
+        stream, response = open_sitemap_stream(source)
+    else:
+        stream = source
+
+    try:
+        context = ET.iterparse(stream, events=('start', 'end'))
+        root = None
+        entry = {}
+        for event, elem in context:
+            name = _local_name(elem.tag)
+            if event == 'start':
+                if root is None:
+                    root = elem
+                if name in ('url', 'sitemap'):
+                    entry = {}
+                continue
+
+            if name in ('loc', 'lastmod'):
+                entry[name] = (elem.text or '').strip()
+            elif name == 'url':
+                if entry.get('loc'):
+                    yield {
+                        'url': entry['loc'],
+                        'lastmod': parse_lastmod(entry.get('lastmod'))
+                    }
+                root.clear()
+            elif name == 'sitemap':
+                child = entry.get('loc')
+                root.clear()
+                if child and depth < MAX_INDEX_DEPTH:
+                    yield from iter_sitemap_entries(child, depth + 1)
+    finally:
+        if response is not None:
+            response.close()
+
+def needs_analysis(entry: Dict[str, Any], last_analyzed: Optional[float]) -> bool:
+    """Decide whether a sitemap entry changed since its last analysis (a Unix timestamp)."""
+    if last_analyzed is None or entry['lastmod'] is None:
+        return True
+    return entry['lastmod'].timestamp() > last_analyzed
+
+def ingest_sitemap(sitemap_url: str,
+                   analyze_fn: Callable[[str], Dict[str, Any]],
+                   on_result: Optional[Callable[[str, Dict[str, Any]], None]] = None,
+                   workers: int = 4,
+                   limit: Optional[int] = None,
+                   store: Optional[SharedStore] = None,
+                   batch_id: Optional[str] = None) -> Dict[str, Any]:
+    """Analyze the pages of a sitemap that changed since their last analysis.
+
+    Entries are streamed into the shared job queue under ``batch_id`` and
+    processed by ``workers`` local threads; workers in other processes can
+    join the same batch with ``run_worker``. Entries are enqueued in chunks
+    as they are parsed, without waiting for the workers: the queue is on
+    disk, so memory stays flat and each sitemap response is read straight
+    through rather than held open for the whole crawl. The producer lease
+    of the batch is renewed while entries are being enqueued. Reading stops
+    as soon as ``limit`` pages are scheduled, so later shards are never
+    fetched.
+    """
+    store = store or get_shared_store()
+    batch_id = batch_id or store.create_batch(sitemap_url)
+
+    # Workers keep polling until the batch is marked as fully enqueued, or
+    # this producer's lease expires; they must not leave while it is alive
+    threads = [
+        Thread(target=run_worker, args=(store, batch_id, analyze_fn, on_result),
+               kwargs={'idle_timeout': None}, daemon=True)
+        for _ in range(workers)
+    ]
+    for thread in threads:
+        thread.start()
+
+    scheduled = 0
+    limit_reached = False
+    chunk = []
+    discovered = 0
+    unchanged = 0
+
+    def flush():
+        nonlocal chunk, discovered, unchanged
+        store.enqueue(batch_id, chunk)
+        store.update_batch(batch_id, discovered=discovered, unchanged=unchanged)
+        chunk, discovered, unchanged = [], 0, 0
+
+    with Heartbeat(lambda: store.renew_batch(batch_id), PRODUCER_LEASE / 3):
+        try:
+            with closing(iter_sitemap_entries(sitemap_url)) as entries:
+                for entry in entries:
+                    discovered += 1
+                    if not needs_analysis(entry, store.last_analyzed(entry['url'])):
+                        unchanged += 1
+                        continue
+                    scheduled += 1
+                    chunk.append(entry['url'])
+                    if len(chunk) >= ENQUEUE_CHUNK:
+                        flush()
+                    if limit is not None and scheduled >= limit:
+                        limit_reached = True
+                        break
+        except Exception as e:
+            # Runs in the background, so the batch is where callers see why it stopped
+            store.update_batch(batch_id, error=f'Sitemap ingestion failed: {str(e)}')
+            raise
+        finally:
+            flush()
+            store.update_batch(batch_id, enqueuing=False, limit_reached=limit_reached)
+            for thread in threads:
+                thread.join()
+
+    return store.batch_status(batch_id)
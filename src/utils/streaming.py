@@ -0,0 +1,38 @@
+from typing import Any, Iterator
+from flask import Response
+import json
+import zlib
+
+CHUNK_SIZE = 16 * 1024
+
+def _json_chunks(data: Any) -> Iterator[bytes]:
+    """Encode ``data`` incrementally, yielding roughly CHUNK_SIZE byte chunks."""
+    buffer = []
+    size = 0
+    for piece in json.JSONEncoder(default=str).iterencode(data):
+        buffer.append(piece)
+        size += len(piece)
+        if size >= CHUNK_SIZE:
+            yield ''.join(buffer).encode('utf-8')
+            buffer = []
+            size = 0
+    if buffer:
+        yield ''.join(buffer).encode('utf-8')
+
+def _gzip_chunks(chunks: Iterator[bytes]) -> Iterator[bytes]:
+    """Gzip a stream of chunks on the fly."""
+    compressor = zlib.compressobj(6, zlib.DEFLATED, 16 + zlib.MAX_WBITS)
+    for chunk in chunks:
+        compressed = compressor.compress(chunk)
+        if compressed:
+            yield compressed
+    yield compressor.flush()
+
+def stream_json(data: Any, accept_encoding: str = '', status: int = 200) -> Response:
+    """Stream ``data`` as JSON, gzip-compressed when the client accepts it."""
+    chunks = _json_chunks(data)
+    headers = {'Vary': 'Accept-Encoding'}
+    if 'gzip' in (accept_encoding or '').lower():
+        chunks = _gzip_chunks(chunks)
+        headers['Content-Encoding'] = 'gzip'
+    return Response(chunks, status=status, mimetype='application/json', headers=headers)
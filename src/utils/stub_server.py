@@ -0,0 +1,145 @@
+from typing import Dict, Any, List, Optional
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from threading import Lock, Thread
+import gzip
+import sys
+import time
+
+class _QuietServer(ThreadingHTTPServer):
+    """Ignores clients that hang up early, e.g. head-only fetches."""
+
+    def handle_error(self, request, client_address):
+        if not isinstance(sys.exc_info()[1], (ConnectionResetError, BrokenPipeError)):
+            super().handle_error(request, client_address)
+
+class StubServer:
+    """Local HTTP server for exercising the fetch client offline.
+
+    Routes map a path to a list of scripted responses; each request to the
+    path consumes the next one and the last is repeated. Every request is
+    recorded with its arrival time so throughput and per-host politeness
+    can be measured.
+
+        with StubServer({'/': [{'status': 429, 'headers': {'Retry-After': '1'}},
+                               {'body': '<html>...</html>'}]}) as server:
+            fetch(server.url('/'))
+    """
+
+    def __init__(self, routes: Optional[Dict[str, List[Dict[str, Any]]]] = None,
+                 host: str = '127.0.0.1', port: int = 0):
+        self.routes = routes or {}
+        self.requests: List[Dict[str, Any]] = []
+        self.lock = Lock()
+        self._served: Dict[str, int] = {}
+        self._server = _QuietServer((host, port), self._make_handler())
+        self._thread = None
+
+    @property
+    def base_url(self) -> str:
+        host, port = self._server.server_address[:2]
+        return f'http://{host}:{port}'
+
+    def url(self, path: str = '/') -> str:
+        return self.base_url + path
+
+    def add_route(self, path: str, responses: List[Dict[str, Any]]) -> None:
+        with self.lock:
+            self.routes[path] = responses
+            self._served[path] = 0
+
+    def request_times(self, path: Optional[str] = None) -> List[float]:
+        """Arrival times of recorded requests, optionally filtered by path."""
+        with self.lock:
+            return [r['time'] for r in self.requests if path is None or r['path'] == path]
+
+    def _next_response(self, path: str) -> Dict[str, Any]:
+        with self.lock:
+            responses = self.routes.get(path)
+            if not responses:
+                return {'status': 404, 'body': 'Not Found'}
+            index = self._served.get(path, 0)
+            self._served[path] = index + 1
+            return responses[min(index, len(responses) - 1)]
+
+    def _make_handler(self):
+        server = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = 'HTTP/1.1'
+
+            def do_GET(self):
+                path = self.path.split('?', 1)[0]
+                with server.lock:
+                    server.requests.append({
+                        'path': path,
+                        'time': time.monotonic(),
+                        'headers': dict(self.headers)
+                    })
+
+                spec = server._next_response(path)
+                if spec.get('delay'):
+                    time.sleep(spec['delay'])
+
+                body = spec.get('body', '')
+                body = body.encode('utf-8') if isinstance(body, str) else body
+                headers = dict(spec.get('headers', {}))
+                if spec.get('gzip') and 'gzip' in self.headers.get('Accept-Encoding', ''):
+                    body = gzip.compress(body)
+                    headers['Content-Encoding'] = 'gzip'
+                headers.setdefault('Content-Type', 'text/html; charset=utf-8')
+
+                self.send_response(spec.get('status', 200))
+                for name, value in headers.items():
+                    self.send_header(name, value)
+                self.send_header('Content-Length', str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+            def log_message(self, format, *args):
+                pass
+
+        return Handler
+
+    def start(self) -> 'StubServer':
+        self._thread = Thread(target=self._server.serve_forever, daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self) -> None:
+        self._server.shutdown()
+        self._server.server_close()
+        if self._thread:
+            self._thread.join()
+
+    def __enter__(self) -> 'StubServer':
+        return self.start()
+
+    def __exit__(self, exc_type, exc, tb) -> None:
+        self.stop()
+
+if __name__ == '__main__':
+    # Offline throughput and politeness check: python -m src.utils.stub_server
+    from concurrent.futures import ThreadPoolExecutor
+    from .http_client import FetchClient
+
+    page = '<html><head><title>Stub</title></head><body>' + '<p>Hello world</p>' * 500 + '</body></html>'
+    routes = {
+        '/page': [{'body': page, 'gzip': True}],
+        '/flaky': [{'status': 503}, {'status': 429, 'headers': {'Retry-After': '1'}}, {'body': 'ok'}]
+    }
+
+    with StubServer(routes) as stub:
+        client = FetchClient(rate_per_host=20, burst=5, backoff_base=0.1)
+
+        start = time.monotonic()
+        with ThreadPoolExecutor(max_workers=8) as pool:
+            statuses = list(pool.map(lambda _: client.get(stub.url('/page')).status_code, range(100)))
+        elapsed = time.monotonic() - start
+        print(f"100 requests in {elapsed:.2f}s ({100 / elapsed:.1f} req/s, limit 20 req/s + burst 5)")
+        print(f"All 200: {all(status == 200 for status in statuses)}")
+        print(f"Compressed: {stub.requests[0]['headers'].get('Accept-Encoding')}")
+
+        start = time.monotonic()
+        response = client.get(stub.url('/flaky'))
+        print(f"Flaky endpoint: status {response.status_code} after "
+              f"{len(stub.request_times('/flaky'))} attempts in {time.monotonic() - start:.2f}s")
@@ -1,5 +1,6 @@
 let currentUrl = '';
 let currentAnalysis = null;
+let detailPage = 1;
 
 // Initialize Bootstrap modal for saving analyses
 const saveModal = new bootstrap.Modal(document.getElementById('saveAnalysisModal'));
@@ -79,7 +80,7 @@ document.getElementById('seoForm').addEventListener('submit', async (e) => {
         console.log('Page Load Time:', data.performance.page_load_time);
         console.log('Server Response Time:', data.performance.server_response_time);
 
-        document.getElementById('readabilityScore').textContent = data.readability_score.toFixed(2);
+        document.getElementById('readabilityScore').textContent = data.readability_score === null ? 'N/A' : data.readability_score.toFixed(1);
         
         // Update performance metrics
         document.getElementById('pageLoadTime').textContent = `${data.performance.page_load_time.toFixed(2)}s`;
@@ -107,7 +108,7 @@ document.getElementById('seoForm').addEventListener('submit', async (e) => {
                 <strong>Technical:</strong> ${formatScore(data.technical_score)} (20% weight)
             </div>
             <div class="mb-2">
-                <strong>Readability:</strong> ${formatScore(data.readability_score * 100)} (15% weight)
+                <strong>Readability:</strong> ${data.readability_score === null ? '<span class="text-muted">N/A</span>' : formatScore(data.readability_score)} (15% weight)
             </div>
         `;
         
@@ -161,6 +162,13 @@ document.getElementById('seoForm').addEventListener('submit', async (e) => {
         
         Plotly.newPlot('keywordChart', [trace], layout);
         
+        // Detail lists are loaded lazily from the stored result
+        document.getElementById('detailHead').innerHTML = '';
+        document.getElementById('detailBody').innerHTML = '';
+        document.getElementById('detailPageInfo').textContent = '';
+        document.getElementById('detailPrev').disabled = true;
+        document.getElementById('detailNext').disabled = true;
+        
         // Show results
         document.querySelector('.loading').style.display = 'none';
         document.querySelector('.result-section').style.display = 'block';
@@ -172,6 +180,74 @@ document.getElementById('seoForm').addEventListener('submit', async (e) => {
     }
 });
 
+// Detail table columns for each result list
+const detailColumns = {
+    links: [['text', 'Text'], ['url', 'URL'], ['internal', 'Internal']],
+    images: [['src', 'Source'], ['width', 'Width'], ['height', 'Height']],
+    keywords: [['keyword', 'Keyword'], ['count', 'Count'], ['density', 'Density (%)']]
+};
+
+// Load one page of links, images or keywords for the current result
+async function loadDetails(page) {
+    if (!currentAnalysis || !currentAnalysis.result_id) {
+        alert('Run an analysis first');
+        return;
+    }
+    
+    const [kind, variant] = document.getElementById('detailType').value.split(':');
+    const params = new URLSearchParams({ page, per_page: 50 });
+    const filter = document.getElementById('detailFilter').value.trim();
+    if (filter) {
+        params.set('q', filter);
+    }
+    if (kind === 'links' && variant) {
+        params.set('type', variant);
+    }
+    if (kind === 'images' && variant) {
+        params.set('list', variant);
+    }
+    
+    try {
+        const response = await fetch(`/results/${currentAnalysis.result_id}/${kind}?${params}`);
+        const result = await response.json();
+        if (result.status !== 'success') {
+            throw new Error(result.message);
+        }
+        
+        const columns = detailColumns[kind].filter(([key]) => kind !== 'images' || variant === 'sizes' || key === 'src');
+        document.getElementById('detailHead').innerHTML = '<tr>' + columns.map(([, label]) => `<th>${label}</th>`).join('') + '</tr>';
+        
+        const body = document.getElementById('detailBody');
+        body.innerHTML = '';
+        result.items.forEach(item => {
+            const row = document.createElement('tr');
+            columns.forEach(([key]) => {
+                const cell = document.createElement('td');
+                const value = item[key];
+                if (typeof value === 'boolean') {
+                    cell.innerHTML = formatStatus(value);
+                } else {
+                    cell.textContent = value ?? '-';
+                }
+                row.appendChild(cell);
+            });
+            body.appendChild(row);
+        });
+        
+        detailPage = result.page;
+        document.getElementById('detailPageInfo').textContent = `Page ${result.page} of ${result.pages} (${result.total} items)`;
+        document.getElementById('detailPrev').disabled = result.page <= 1;
+        document.getElementById('detailNext').disabled = result.page >= result.pages;
+    } catch (error) {
+        console.error('Error:', error);
+        alert('Failed to load details: ' + error.message);
+    }
+}
+
+document.getElementById('loadDetailsBtn').addEventListener('click', () => loadDetails(1));
+document.getElementById('detailPrev').addEventListener('click', () => loadDetails(detailPage - 1));
+document.getElementById('detailNext').addEventListener('click', () => loadDetails(detailPage + 1));
+
 // Handle save analysis
 document.getElementById('saveAnalysisBtn').addEventListener('click', async () => {
     if (!currentAnalysis) {
@@ -248,7 +324,10 @@ document.getElementById('exportBtn').addEventListener('click', async () => {
             headers: {
                 'Content-Type': 'application/json'
             },
-            body: JSON.stringify({ url: currentUrl })
+            body: JSON.stringify({
+                url: currentUrl,
+                result_id: currentAnalysis ? currentAnalysis.result_id : null
+            })
         });
         
         if (response.ok) {
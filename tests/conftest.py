@@ -0,0 +1,14 @@
+import os
+import sys
+import pytest
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from src.utils.stub_server import StubServer
+
+
+@pytest.fixture
+def stub_server():
+    """A started local StubServer; add routes with ``add_route``."""
+    with StubServer() as server:
+        yield server
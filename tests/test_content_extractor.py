@@ -0,0 +1,64 @@
+from bs4 import BeautifulSoup
+
+from src.utils.content_extractor import extract_main_content
+
+ARTICLE = '<p>' + 'Search engines reward pages whose main content is easy to read. ' * 3 + '</p>'
+
+
+def extract(html):
+    return extract_main_content(BeautifulSoup(html, 'html.parser'))
+
+
+def test_link_dense_navigation_and_overlays_are_dropped():
+    nav = '<nav>' + ''.join(f'<a href="/p{i}">Section {i}</a> ' for i in range(30)) + '</nav>'
+    menu = '<div class="site-menu">' + ''.join(f'<a href="/m{i}">Menu item {i}</a> ' for i in range(20)) + '</div>'
+    cookie = '<div class="cookie-banner">We use cookies to improve your experience on this site.</div>'
+    result = extract(f'<html><body>{nav}{menu}{cookie}<article>{ARTICLE}</article></body></html>')
+
+    assert 'Search engines reward' in result['text']
+    assert 'Section' not in result['text'] and 'Menu item' not in result['text']
+    assert 'cookies' not in result['text']
+    assert result['word_count'] == 33
+    assert result['boilerplate_ratio'] == 0.0
+
+
+def test_text_heavy_header_and_footer_are_kept():
+    # Structural containers are only dropped when they are mostly links
+    footer = '<footer><p>' + 'Our family bakery has served the town since 1952 with fresh bread. ' * 2 + '</p></footer>'
+    result = extract(f'<html><body><div>{ARTICLE}</div>{footer}</body></html>')
+
+    assert 'family bakery' in result['text']
+
+
+def test_aspnet_form_wrapper_is_kept():
+    html = f'<html><body><form id="aspnetForm" method="post"><div id="content">{ARTICLE}</div></form></body></html>'
+    result = extract(html)
+
+    assert result['word_count'] == 33
+    assert 'Search engines reward' in result['text']
+
+
+def test_marker_words_only_match_whole_class_tokens():
+    # "navigation-free" and "headerless" are not navigation markers
+    html = (f'<html><body><div class="navigation-free headerless">{ARTICLE}</div>'
+            f'<div class="share-bar"><a href="/s">Share on social media</a></div></body></html>')
+    result = extract(html)
+
+    assert result['word_count'] == 33
+    assert 'Share' not in result['text']
+
+
+def test_inline_markup_does_not_split_words():
+    result = extract('<html><body><p><b>W</b>ord and <i>in</i>line <span>spl</span>it text stays whole '
+                     'in this sentence here.</p></body></html>')
+
+    assert 'Word and inline split text' in result['text']
+    assert result['word_count'] == 11
+
+
+def test_short_pages_fall_back_to_visible_text():
+    result = extract('<html><body><nav><a href="/">Home</a></nav><div>Just a short note.</div></body></html>')
+
+    assert result['word_count'] > 0
+    assert 'short note' in result['text']
+    assert extract('<html><body></body></html>')['word_count'] == 0
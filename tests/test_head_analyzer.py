@@ -0,0 +1,82 @@
+from bs4 import BeautifulSoup
+
+from src.analyzers.head_analyzer import HeadAnalyzer
+
+BODY_JSON_LD = '''<html><head><title>Shop</title></head>
+<body><h1>Widget</h1>
+<script type="application/ld+json">{"@context": "https://schema.org", "@type": "Product", "name": "Widget"}</script>
+</body></html>'''
+
+
+def test_json_ld_in_body_is_collected_from_full_document():
+    head = HeadAnalyzer(BeautifulSoup(BODY_JSON_LD, 'html.parser')).analyze()
+
+    assert head['schema_types'] == ['Product']
+    assert not any('JSON-LD' in rec for rec in head['recommendations'])
+
+
+def test_head_only_analysis_stops_at_head():
+    head = HeadAnalyzer.from_html(BODY_JSON_LD).analyze()
+
+    assert head['title'] == 'Shop'
+    assert head['json_ld'] == []
+
+
+FULL_HEAD = '''<html><head>
+<meta charset="utf-8">
+<title>  Example Page  </title>
+<title>Second title</title>
+<meta name="description" content="An example page">
+<meta name="viewport" content="width=device-width, initial-scale=1">
+<meta name="robots" content="index, follow">
+<link rel="canonical" href="https://example.com/page">
+<link rel="alternate" hreflang="de" href="https://example.com/de/page">
+<link rel="alternate" hreflang="x-default" href="https://example.com/page">
+<link rel="alternate" type="application/rss+xml" href="/feed.xml">
+<meta property="og:title" content="OG title">
+<meta property="og:image" content="https://example.com/og.png">
+<meta name="twitter:card" content="summary_large_image">
+<meta property="twitter:site" content="@example">
+<script type="application/ld+json">
+{"@context": "https://schema.org", "@graph": [
+  {"@type": "WebPage", "name": "Example"},
+  {"@type": ["Organization", "LocalBusiness"], "name": "Example Inc"}
+]}
+</script>
+<script type="application/ld+json">{"@type": "WebPage"}</script>
+<script type="application/ld+json">{not json</script>
+</head><body></body></html>'''
+
+
+def test_head_metadata_is_extracted():
+    head = HeadAnalyzer.from_html(FULL_HEAD).analyze()
+
+    assert head['title'] == 'Example Page'
+    assert head['meta_description'] == 'An example page'
+    assert head['viewport'].startswith('width=device-width')
+    assert head['robots'] == 'index, follow'
+    assert head['charset'] == 'utf-8'
+    assert head['canonical'] == 'https://example.com/page'
+    assert head['hreflang'] == [
+        {'hreflang': 'de', 'href': 'https://example.com/de/page'},
+        {'hreflang': 'x-default', 'href': 'https://example.com/page'}
+    ]
+
+
+def test_social_cards_and_graph_types():
+    head = HeadAnalyzer.from_html(FULL_HEAD).analyze()
+
+    assert head['open_graph'] == {'title': 'OG title', 'image': 'https://example.com/og.png'}
+    assert head['twitter_card'] == {'card': 'summary_large_image', 'site': '@example'}
+    # @graph items and list-valued @type are flattened without duplicates
+    assert head['schema_types'] == ['WebPage', 'Organization', 'LocalBusiness']
+    assert len(head['json_ld']) == 2 and head['json_ld_errors'] == 1
+    assert head['recommendations'] == ['Fix invalid JSON-LD blocks']
+
+
+def test_missing_metadata_is_recommended():
+    head = HeadAnalyzer.from_html('<html><head></head><body><p>Hi</p></body></html>').analyze()
+
+    assert head['title'] is None and head['canonical'] is None
+    assert "Add a descriptive <title> tag" in head['recommendations']
+    assert "Add JSON-LD structured data to qualify for rich results" in head['recommendations']
@@ -0,0 +1,101 @@
+import time
+from email.utils import format_datetime
+from datetime import datetime, timedelta, timezone
+
+import pytest
+import requests
+
+from src.utils.http_client import FetchClient, TokenBucket, parse_retry_after
+
+
+def test_token_bucket_spaces_requests_after_burst():
+    bucket = TokenBucket(rate=20, capacity=2)
+    start = time.monotonic()
+    for _ in range(6):
+        bucket.acquire()
+    # Two tokens are free, the remaining four are spaced 1/20s apart
+    assert time.monotonic() - start >= 4 / 20 - 0.02
+
+
+def test_parse_retry_after_seconds_and_http_date():
+    assert parse_retry_after('3') == 3.0
+    assert parse_retry_after(None) is None
+    assert parse_retry_after('soon') is None
+    future = datetime.now(timezone.utc) + timedelta(seconds=10)
+    assert 8 <= parse_retry_after(format_datetime(future, usegmt=True)) <= 10
+
+
+def test_requests_to_one_host_respect_rate_limit(stub_server):
+    stub_server.add_route('/page', [{'body': 'ok'}])
+    client = FetchClient(rate_per_host=10, burst=1)
+
+    for _ in range(5):
+        assert client.get(stub_server.url('/page')).status_code == 200
+
+    times = stub_server.request_times('/page')
+    gaps = [later - earlier for earlier, later in zip(times, times[1:])]
+    assert len(times) == 5
+    assert min(gaps) >= 0.1 - 0.02
+
+
+def test_retry_after_on_429_is_honored(stub_server):
+    stub_server.add_route('/limited', [
+        {'status': 429, 'headers': {'Retry-After': '1'}},
+        {'body': 'ok'}
+    ])
+    client = FetchClient(rate_per_host=100, burst=10)
+
+    response = client.get(stub_server.url('/limited'))
+
+    times = stub_server.request_times('/limited')
+    assert response.status_code == 200
+    assert response.text == 'ok'
+    assert len(times) == 2
+    assert times[1] - times[0] >= 1.0 - 0.05
+
+
+def test_5xx_is_retried_with_backoff(stub_server):
+    stub_server.add_route('/flaky', [{'status': 503}, {'status': 502}, {'body': 'ok'}])
+    client = FetchClient(rate_per_host=100, burst=10, backoff_base=0.05)
+
+    response = client.get(stub_server.url('/flaky'))
+
+    assert response.status_code == 200
+    assert len(stub_server.request_times('/flaky')) == 3
+
+
+def test_retry_limit_returns_last_response(stub_server):
+    stub_server.add_route('/down', [{'status': 503}])
+    client = FetchClient(rate_per_host=100, burst=10, max_retries=2, backoff_base=0.01)
+
+    response = client.get(stub_server.url('/down'))
+
+    assert response.status_code == 503
+    assert len(stub_server.request_times('/down')) == 3
+
+
+def test_client_errors_are_not_retried(stub_server):
+    stub_server.add_route('/missing', [{'status': 404}])
+    client = FetchClient(rate_per_host=100, burst=10)
+
+    assert client.get(stub_server.url('/missing')).status_code == 404
+    assert len(stub_server.request_times('/missing')) == 1
+
+
+def test_connection_errors_raise_after_retries():
+    client = FetchClient(rate_per_host=100, burst=10, max_retries=1, backoff_base=0.01, timeout=1)
+    # Nothing listens on port 9 locally, so every attempt is refused
+    with pytest.raises(requests.exceptions.ConnectionError):
+        client.get('http://127.0.0.1:9/')
+
+
+def test_default_headers_are_sent(stub_server):
+    stub_server.add_route('/page', [{'body': 'ok', 'gzip': True}])
+    client = FetchClient(user_agent='test-agent')
+
+    response = client.get(stub_server.url('/page'))
+
+    headers = stub_server.requests[0]['headers']
+    assert response.text == 'ok'
+    assert headers['User-Agent'] == 'test-agent'
+    assert 'gzip' in headers['Accept-Encoding']
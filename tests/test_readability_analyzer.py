@@ -0,0 +1,58 @@
+import pytest
+from bs4 import BeautifulSoup
+
+from src.analyzers.readability_analyzer import ReadabilityAnalyzer, count_syllables
+
+
+def analyze(text):
+    return ReadabilityAnalyzer(BeautifulSoup('', 'html.parser'), text).analyze()
+
+
+def test_counts_and_formulas_for_simple_text():
+    result = analyze('The cat sat on the mat. The dog ran.')
+
+    assert (result['words'], result['sentences'], result['syllables'], result['complex_words']) == (9, 2, 9, 0)
+    # 9 words in 2 sentences, one syllable each
+    assert result['flesch_reading_ease'] == pytest.approx(206.835 - 1.015 * 4.5 - 84.6, abs=0.01)
+    assert result['flesch_kincaid_grade'] == pytest.approx(0.39 * 4.5 + 11.8 - 15.59, abs=0.01)
+    assert result['gunning_fog'] == pytest.approx(0.4 * 4.5, abs=0.01)
+    assert result['smog_index'] == pytest.approx(3.1291, abs=0.01)
+    # Reading ease above 100 is clamped for the score
+    assert result['readability_score'] == 100.0
+
+
+def test_complex_words_lower_the_score():
+    result = analyze('Education is beautiful')
+
+    assert (result['words'], result['sentences'], result['syllables'], result['complex_words']) == (3, 1, 8, 2)
+    assert result['gunning_fog'] == pytest.approx(0.4 * (3 + 100 * 2 / 3), abs=0.01)
+    assert result['readability_score'] == 0.0
+
+
+def test_syllable_estimates():
+    assert count_syllables('cat') == 1
+    assert count_syllables('make') == 1
+    assert count_syllables('table') == 2
+    assert count_syllables('wanted') == 2
+    assert count_syllables('jumped') == 1
+    assert count_syllables("don't") == 1
+
+
+@pytest.mark.parametrize('text', ['', '   ', '123 456... !!! 2024'])
+def test_text_without_words_has_no_score(text):
+    result = analyze(text)
+
+    assert result['words'] == 0
+    assert result['readability_score'] is None
+    assert result['flesch_reading_ease'] is None and result['smog_index'] is None
+
+
+def test_unicode_words_are_not_split_or_dropped():
+    assert analyze('Größe über Straße. Café naïve!')['words'] == 5
+    assert analyze('Größe über Straße. Café naïve!')['sentences'] == 2
+    assert analyze('Привет мир! Как дела?')['words'] == 4
+    assert analyze('Ελληνικά κείμενα.')['words'] == 2
+    assert analyze('こんにちは。さようなら。')['sentences'] == 2
+    # Apostrophes join a word and numbers are not words
+    result = analyze("We don't grow 25% in 2024, l’été.")
+    assert result['words'] == 5 and result['sentences'] == 1
@@ -0,0 +1,20 @@
+from src.utils.result_store import summarize_result
+
+
+def test_summary_drops_detail_lists_and_keeps_counts():
+    result = {
+        'url': 'https://example.com/',
+        'link_analysis': {'total_links': 2, 'link_texts': [{'text': 'Home', 'url': '/', 'internal': True}]},
+        'image_analysis': {'total_images': 1, 'missing_alt_texts': ['/a.png'], 'image_sizes': []},
+        'keywords': [{'keyword': 'seo', 'count': 3}]
+    }
+
+    summary = summarize_result(result, 'abc')
+
+    assert summary['result_id'] == 'abc'
+    assert 'keywords' not in summary
+    assert summary['link_analysis'] == {'total_links': 2}
+    assert summary['image_analysis'] == {'total_images': 1}
+    # The stored result itself is left intact
+    assert result['link_analysis']['link_texts'] and result['keywords']
+
@@ -0,0 +1,177 @@
+import time
+from threading import Lock, Thread
+
+import pytest
+import requests
+
+from src.utils.http_client import FetchClient, SharedTokenBucket
+from src.utils.result_store import ResultStore
+from src.utils.shared_store import SharedStore, run_worker
+
+
+def make_store(tmp_path, **kwargs):
+    return SharedStore(str(tmp_path / 'seo.db'), **kwargs)
+
+
+def test_slow_job_keeps_its_lease_and_is_reported_once(tmp_path):
+    store = make_store(tmp_path)
+    batch_id = store.create_batch('test')
+    store.enqueue(batch_id, ['https://example.com/slow'])
+    store.update_batch(batch_id, enqueuing=False)
+
+    reported = []
+    lock = Lock()
+
+    def analyze(url):
+        # Runs for several lease periods; renewals must keep other workers off it
+        time.sleep(1.0)
+        return {'status': 'success', 'url': url}
+
+    def on_result(url, result):
+        with lock:
+            reported.append(url)
+
+    workers = [
+        Thread(target=run_worker, args=(store, batch_id, analyze, on_result),
+               kwargs={'lease_seconds': 0.3, 'poll_interval': 0.05})
+        for _ in range(3)
+    ]
+    for worker in workers:
+        worker.start()
+    for worker in workers:
+        worker.join()
+
+    assert reported == ['https://example.com/slow']
+    status = store.batch_status(batch_id)
+    assert status['analyzed'] == 1 and status['failed'] == 0
+
+
+def test_lost_lease_neither_stores_nor_reports(tmp_path):
+    store = make_store(tmp_path)
+    batch_id = store.create_batch('test')
+    store.enqueue(batch_id, ['https://example.com/'])
+    store.update_batch(batch_id, enqueuing=False)
+
+    reported = []
+
+    def analyze(url):
+        # Another worker took the job over while this one was stalled, and finished it
+        store._connection().execute("UPDATE jobs SET lease_owner = 'other', status = 'done'")
+        return {'status': 'success', 'url': url}
+
+    thread = Thread(target=run_worker, args=(store, batch_id, analyze, lambda u, r: reported.append(u)),
+                    kwargs={'poll_interval': 0.05})
+    thread.start()
+    thread.join()
+
+    assert reported == []
+    assert store._connection().execute('SELECT COUNT(*) FROM results').fetchone()[0] == 0
+
+
+def test_result_detail_lists_are_paged_and_filtered(tmp_path):
+    results = ResultStore(make_store(tmp_path))
+    result = {
+        'url': 'https://example.com/',
+        'link_analysis': {'total_links': 3, 'link_texts': [
+            {'text': 'Home', 'url': 'https://example.com/', 'internal': True},
+            {'text': 'Blog', 'url': 'https://example.com/blog', 'internal': True},
+            {'text': 'Partner', 'url': 'https://partner.org/', 'internal': False}
+        ]},
+        'keywords': [{'keyword': 'seo', 'count': 5}, {'keyword': 'page', 'count': 1}]
+    }
+    result_id = results.put(result)
+
+    summary = results.get_summary(result_id)
+    assert 'link_texts' not in summary['link_analysis'] and 'keywords' not in summary
+
+    internal = results.page(result_id, 'links', per_page=1, page=2, flag=1)
+    assert internal['total'] == 2 and internal['pages'] == 2
+    assert internal['items'] == [result['link_analysis']['link_texts'][1]]
+    assert results.page(result_id, 'links', query='PARTNER')['total'] == 1
+    assert results.page(result_id, 'keywords', min_flag=2)['items'] == [{'keyword': 'seo', 'count': 5}]
+
+    assert results.get(result_id) == result
+    assert results.page('unknown', 'links') is None
+
+
+def test_batch_of_crashed_producer_finishes(tmp_path):
+    store = make_store(tmp_path)
+    batch_id = store.create_batch('test')
+    store.enqueue(batch_id, ['https://example.com/'])
+    assert store.batch_status(batch_id)['enqueuing']
+
+    # The producer never marks the batch as enqueued nor renews its lease
+    store._connection().execute('UPDATE batches SET producer_expires = ?', (time.time() - 1,))
+    processed = run_worker(store, batch_id, lambda url: {'status': 'success', 'url': url},
+                           poll_interval=0.05, idle_timeout=None)
+
+    status = store.batch_status(batch_id)
+    assert processed == 1
+    assert status['producer_lost'] and status['finished']
+
+
+def test_worker_leaves_idle_batch(tmp_path):
+    store = make_store(tmp_path)
+    batch_id = store.create_batch('test')
+
+    start = time.monotonic()
+    assert run_worker(store, batch_id, lambda url: {}, poll_interval=0.05, idle_timeout=0.3) == 0
+    assert 0.3 <= time.monotonic() - start < 2
+    assert not store.batch_status(batch_id)['finished']
+
+
+def test_failed_sitemap_ingestion_is_recorded_on_batch(tmp_path, stub_server):
+    from src.utils.sitemap import ingest_sitemap
+
+    store = make_store(tmp_path)
+    batch_id = store.create_batch(stub_server.url('/sitemap.xml'))
+    with pytest.raises(requests.HTTPError):
+        ingest_sitemap(stub_server.url('/sitemap.xml'), lambda url: {}, workers=1,
+                       store=store, batch_id=batch_id)
+
+    status = store.batch_status(batch_id)
+    assert status['finished']
+    assert '404' in status['error']
+
+
+def test_rate_limit_is_shared_between_processes(tmp_path, stub_server):
+    stub_server.add_route('/page', [{'body': 'ok'}])
+    store = make_store(tmp_path)
+    # Two clients stand in for two worker processes using the same store
+    clients = [
+        FetchClient(bucket_factory=lambda host: SharedTokenBucket(store, host, rate=10, capacity=1))
+        for _ in range(2)
+    ]
+
+    threads = [
+        Thread(target=lambda c=client: [c.get(stub_server.url('/page')) for _ in range(4)])
+        for client in clients
+    ]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    times = sorted(stub_server.request_times('/page'))
+    gaps = [later - earlier for earlier, later in zip(times, times[1:])]
+    assert len(times) == 8
+    assert min(gaps) >= 0.1 - 0.03
+
+
+def test_retry_after_holds_off_other_processes(tmp_path, stub_server):
+    stub_server.add_route('/busy', [{'status': 429, 'headers': {'Retry-After': '1'}}, {'body': 'ok'}])
+    stub_server.add_route('/page', [{'body': 'ok'}])
+    store = make_store(tmp_path)
+    first, second = [
+        FetchClient(bucket_factory=lambda host: SharedTokenBucket(store, host, rate=50, capacity=4))
+        for _ in range(2)
+    ]
+
+    retrying = Thread(target=first.get, args=(stub_server.url('/busy'),))
+    retrying.start()
+    time.sleep(0.2)
+    assert second.get(stub_server.url('/page')).status_code == 200
+    retrying.join()
+
+    throttled_at = stub_server.request_times('/busy')[0]
+    assert stub_server.request_times('/page')[0] - throttled_at >= 0.9
@@ -0,0 +1,122 @@
+import gzip
+import time
+from datetime import datetime, timezone
+
+from src.utils import sitemap
+from src.utils.shared_store import SharedStore
+
+NS = 'http://www.sitemaps.org/schemas/sitemap/0.9'
+XML = {'Content-Type': 'application/xml'}
+
+
+def urlset(urls):
+    entries = ''.join(f'<url><loc>{url}</loc></url>' for url in urls)
+    return f'<?xml version="1.0" encoding="UTF-8"?><urlset xmlns="{NS}">{entries}</urlset>'
+
+
+def sitemap_index(locs):
+    entries = ''.join(f'<sitemap><loc>{loc}</loc></sitemap>' for loc in locs)
+    return f'<?xml version="1.0" encoding="UTF-8"?><sitemapindex xmlns="{NS}">{entries}</sitemapindex>'
+
+
+def test_limit_stops_reading_the_sitemap(tmp_path, stub_server):
+    shards = [f'/shard{i}.xml' for i in range(5)]
+    for i, path in enumerate(shards):
+        stub_server.add_route(path, [{'body': urlset(f'https://example.com/{i}/{n}' for n in range(1000)),
+                                      'headers': XML}])
+    stub_server.add_route('/sitemap.xml', [{'body': sitemap_index(stub_server.url(p) for p in shards),
+                                            'headers': XML}])
+
+    store = SharedStore(str(tmp_path / 'seo.db'))
+    status = sitemap.ingest_sitemap(stub_server.url('/sitemap.xml'), lambda url: {'status': 'success'},
+                                    workers=1, limit=3, store=store)
+
+    assert status['scheduled'] == 3 and status['analyzed'] == 3
+    assert status['limit_reached']
+    assert status['unchanged'] == 0
+    # Only the first shard was ever requested
+    assert stub_server.request_times('/shard0.xml') and not stub_server.request_times('/shard1.xml')
+
+
+def test_only_pages_changed_since_last_analysis_are_scheduled(tmp_path, stub_server):
+    body = (f'<urlset xmlns="{NS}">'
+            '<url><loc>https://example.com/old</loc><lastmod>2024-01-01</lastmod></url>'
+            '<url><loc>https://example.com/new</loc><lastmod>2024-03-01T10:00:00Z</lastmod></url>'
+            '<url><loc>https://example.com/undated</loc></url>'
+            '<url><loc>https://example.com/unseen</loc><lastmod>2024-01-01</lastmod></url>'
+            '</urlset>')
+    stub_server.add_route('/sitemap.xml', [{'body': body, 'headers': XML}])
+    store = SharedStore(str(tmp_path / 'seo.db'))
+    analyzed_at = datetime(2024, 2, 1).timestamp()
+    for url in ('https://example.com/old', 'https://example.com/new', 'https://example.com/undated'):
+        store.record_analysis(url, analyzed_at)
+
+    analyzed = []
+    status = sitemap.ingest_sitemap(stub_server.url('/sitemap.xml'),
+                                    lambda url: analyzed.append(url) or {'status': 'success'},
+                                    workers=1, store=store)
+
+    assert sorted(analyzed) == ['https://example.com/new', 'https://example.com/undated',
+                                'https://example.com/unseen']
+    assert status['unchanged'] == 1 and not status['limit_reached']
+    assert store.last_analyzed('https://example.com/unseen') > analyzed_at
+
+
+def test_index_with_gzipped_shards_is_read_to_the_end(stub_server):
+    nested = [f'https://example.com/nested/{n}' for n in range(3)]
+    zipped = [f'https://example.com/zipped/{n}' for n in range(2000)]
+    stub_server.add_route('/nested.xml', [{'body': urlset(nested), 'headers': XML}])
+    stub_server.add_route('/inner-index.xml', [{'body': sitemap_index([stub_server.url('/nested.xml')]),
+                                                'headers': XML}])
+    # A .xml.gz shard is a gzip file, not a gzip-encoded response
+    stub_server.add_route('/shard.xml.gz', [{'body': gzip.compress(urlset(zipped).encode('utf-8')),
+                                             'headers': {'Content-Type': 'application/x-gzip'}}])
+    stub_server.add_route('/sitemap.xml', [{
+        'body': sitemap_index([stub_server.url('/shard.xml.gz'), stub_server.url('/inner-index.xml')]),
+        'headers': XML
+    }])
+
+    entries = list(sitemap.iter_sitemap_entries(stub_server.url('/sitemap.xml')))
+
+    assert [entry['url'] for entry in entries] == zipped + nested
+    assert all(entry['lastmod'] is None for entry in entries)
+
+
+def test_index_recursion_is_bounded(stub_server):
+    # An index that lists itself must not be followed forever
+    stub_server.add_route('/loop.xml', [{'body': sitemap_index([stub_server.url('/loop.xml')]),
+                                         'headers': XML}])
+
+    assert list(sitemap.iter_sitemap_entries(stub_server.url('/loop.xml'))) == []
+    assert len(stub_server.request_times('/loop.xml')) == sitemap.MAX_INDEX_DEPTH + 1
+
+
+def test_parse_lastmod_formats():
+    assert sitemap.parse_lastmod('2024-03-01') == datetime(2024, 3, 1)
+    assert sitemap.parse_lastmod('not a date') is None
+    assert sitemap.parse_lastmod(None) is None
+    utc = sitemap.parse_lastmod('2024-03-01T10:00:00Z')
+    assert utc.tzinfo is None and utc.timestamp() == datetime(2024, 3, 1, 10, tzinfo=timezone.utc).timestamp()
+
+
+def test_sitemap_is_enqueued_without_waiting_for_workers(tmp_path, stub_server):
+    urls = [f'https://example.com/{n}' for n in range(sitemap.ENQUEUE_CHUNK + 100)]
+    stub_server.add_route('/sitemap.xml', [{'body': urlset(urls), 'headers': XML}])
+    store = SharedStore(str(tmp_path / 'seo.db'))
+    batch_id = store.create_batch(stub_server.url('/sitemap.xml'))
+    enqueuing_seen = []
+
+    def analyze(url):
+        # The first job waits until the producer has read the whole sitemap
+        deadline = time.monotonic() + 5
+        while not enqueuing_seen and time.monotonic() < deadline:
+            if not store.batch_status(batch_id)['enqueuing']:
+                enqueuing_seen.append(False)
+            time.sleep(0.02)
+        return {'status': 'success'}
+
+    status = sitemap.ingest_sitemap(stub_server.url('/sitemap.xml'), analyze, workers=1,
+                                    store=store, batch_id=batch_id)
+
+    assert enqueuing_seen == [False]
+    assert status['scheduled'] == len(urls) and status['analyzed'] == len(urls)